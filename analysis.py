@@ -9,6 +9,11 @@ import tempfile
 from datetime import datetime
 from dateutil import parser as dt_parser
 
+# Leading timestamp, e.g. "2024-01-01 10:00:00" or "[2024-01-01T10:00:00"
+_TS_RE = re.compile(r"^\[?(\d{4}-\d{2}-\d{2}[\sT]\d{2}:\d{2}:\d{2})")
+# _TS_RE can only match lines starting with one of these; anything else skips the regex call
+_TS_LEAD = frozenset("[0123456789")
+
 # Define a class to structure log events
 class InstallEvent:
     def __init__(self, timestamp, component, message, severity="INFO"):
@@ -86,6 +91,7 @@ def parse_zip(zip_file_obj):
         return events, {"Error": f"Failed to process ZIP: {str(e)}"}
 
     for fname, lines in all_logs.items():
+        component = os.path.splitext(fname)[0]
         for line in lines:
             try:
                 # Skip empty lines
@@ -93,7 +99,7 @@ def parse_zip(zip_file_obj):
                     continue
                     
                 # Try to extract timestamp from beginning of line
-                ts_match = re.match(r"^\[?(\d{4}-\d{2}-\d{2}[\sT]\d{2}:\d{2}:\d{2})", line)
+                ts_match = _TS_RE.match(line) if line[:1] in _TS_LEAD else None
                 if ts_match:
                     try:
                         ts = dt_parser.parse(ts_match.group(1))
@@ -102,7 +108,6 @@ def parse_zip(zip_file_obj):
                 else:
                     ts = datetime.now()
 
-                component = os.path.splitext(fname)[0]
                 msg = line.strip()
                 severity = guess_severity(msg)
 
@@ -122,12 +127,13 @@ def parse_logs(text, fname: str = "log.txt"):
     This mirrors the per-line parsing used in parse_zip().
     """
     events = []
+    component = os.path.splitext(fname)[0]
     try:
         for line in str(text).splitlines():
             try:
                 if not line.strip():
                     continue
-                ts_match = re.match(r"^\[?(\d{4}-\d{2}-\d{2}[\sT]\d{2}:\d{2}:\d{2})", line)
+                ts_match = _TS_RE.match(line) if line[:1] in _TS_LEAD else None
                 if ts_match:
                     try:
                         ts = dt_parser.parse(ts_match.group(1))
@@ -135,7 +141,6 @@ def parse_logs(text, fname: str = "log.txt"):
                         ts = datetime.now()
                 else:
                     ts = datetime.now()
-                component = os.path.splitext(fname)[0]
                 msg = line.strip()
                 severity = guess_severity(msg)
                 events.append(InstallEvent(ts, component, msg, severity))
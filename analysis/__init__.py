@@ -8,6 +8,7 @@ from __future__ import annotations
 import os
 import re
 from datetime import datetime
+from operator import itemgetter
 
 try:
     # Prefer python-dateutil if available
@@ -16,6 +17,25 @@ except Exception:  # pragma: no cover
     dt_parser = None  # Fallback to naive timestamping
 
 
+# Leading timestamp, e.g. "2024-01-01 10:00:00" or "[2024-01-01T10:00:00"
+_TS_RE = re.compile(r"^\[?(\d{4}-\d{2}-\d{2}[\sT]\d{2}:\d{2}:\d{2})")
+# _TS_RE can only match lines starting with one of these; anything else skips the regex call
+_TS_LEAD = frozenset("[0123456789")
+
+
+def _parse_ts(raw: str):
+    """Parse a matched timestamp; fromisoformat covers the regex's shapes."""
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        if dt_parser is None:
+            return None
+        try:
+            return dt_parser.parse(raw)  # type: ignore[arg-type]
+        except Exception:
+            return None
+
+
 def _guess_severity(msg: str) -> str:
     m = msg.lower()
     if "error" in m or "failed" in m:
@@ -33,27 +53,34 @@ def parse_logs(text: str, fname: str = "log.txt"):
     Returned objects have attributes: timestamp, component, message, severity.
     This mirrors what the UI expects for downstream processing.
     """
+    return parse_logs_stream(str(text).splitlines(), fname=fname)
+
+
+def parse_logs_stream(lines, fname: str = "log.txt"):
+    """Same as parse_logs, but over any iterable of lines (e.g. a text stream).
+
+    Lets callers parse large files without holding the whole text in memory.
+    """
     events = []
-    for line in str(text).splitlines():
+    append = events.append
+    match = _TS_RE.match
+    now = datetime.now()
+    component = os.path.splitext(os.path.basename(fname))[0]
+    for line in lines:
         try:
-            line = line.rstrip("\n")
-            if not line.strip():
-                continue
-            ts = datetime.now()
-            m = re.match(r"^\[?(\d{4}-\d{2}-\d{2}[\sT]\d{2}:\d{2}:\d{2})", line)
-            if m and dt_parser is not None:
-                try:
-                    ts = dt_parser.parse(m.group(1))  # type: ignore[arg-type]
-                except Exception:
-                    ts = datetime.now()
-            component = os.path.splitext(os.path.basename(fname))[0]
+            # One strip serves both the blank-line check and the message;
+            # the anchored timestamp match still looks at the raw line start
             msg = line.strip()
-            sev = _guess_severity(msg)
-            events.append(
-                {'timestamp': ts, 'component': component, 'message': msg, 'severity': sev}
+            if not msg:
+                continue
+            ts = now
+            m = match(line) if line[:1] in _TS_LEAD else None
+            if m:
+                ts = _parse_ts(m.group(1)) or now
+            append(
+                {'timestamp': ts, 'component': component, 'message': msg, 'severity': _guess_severity(msg)}
             )
         except Exception:
             continue
-        events.sort(key=lambda e: e.get("timestamp", datetime.now()))
+    events.sort(key=itemgetter("timestamp"))
     return events
-
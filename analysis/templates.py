@@ -43,6 +43,7 @@ class TemplateExtractor:
             cfg = TemplateMinerConfig()
             cfg.load_default_config()
             cfg.profiling_enabled = False
+            self._cfg = cfg
             self._tm = TemplateMiner(config=cfg)
         else:
             self._tm = _NaiveTemplateMiner()
@@ -50,37 +51,54 @@ class TemplateExtractor:
         self._id_for_template: Dict[str, str] = {}
         self._next_id = 1
 
+    def reset(self) -> None:
+        """
+        Forget mined templates and counts so one instance can serve many runs.
+        Drain3 config is kept; only the miner state is rebuilt.
+        """
+        if self._use_drain:
+            from drain3 import TemplateMiner
+            self._tm = TemplateMiner(config=self._cfg)
+        self._counts.clear()
+        self._id_for_template.clear()
+        self._next_id = 1
+
     def _id_for(self, template: str) -> str:
         if template not in self._id_for_template:
             self._id_for_template[template] = f"T{self._next_id:04d}"
             self._next_id += 1
         return self._id_for_template[template]
 
+    def _template_of(self, message: str) -> str:
+        if self._use_drain:
+            r = self._tm.add_log_message(message)
+            return r["template_mined"] if r else message
+        return self._tm.add_log_message(message)
+
     def assign(self, events: List[Event]) -> List[Event]:
         out: List[Event] = []
-        if self._use_drain:
-            for ev in events:
-                r = self._tm.add_log_message(ev.message)
-                template = r["template_mined"] if r else ev.message
-                tid = self._id_for(template)
-                self._counts[template] = self._counts.get(template, 0) + 1
-                meta = dict(ev.meta)
-                meta["template_id"] = tid
-                meta["template"] = template
-                out.append(Event(ts=ev.ts, source=ev.source, level=ev.level, event_id=ev.event_id,
-                                 message=ev.message, meta=meta, tags=list(ev.tags)))
-        else:
-            for ev in events:
-                template = self._tm.add_log_message(ev.message)
-                tid = self._id_for(template)
-                self._counts[template] = self._counts.get(template, 0) + 1
-                meta = dict(ev.meta)
-                meta["template_id"] = tid
-                meta["template"] = template
-                out.append(Event(ts=ev.ts, source=ev.source, level=ev.level, event_id=ev.event_id,
-                                 message=ev.message, meta=meta, tags=list(ev.tags)))
+        for ev in events:
+            template = self._template_of(ev.message)
+            tid = self._id_for(template)
+            self._counts[template] = self._counts.get(template, 0) + 1
+            meta = dict(ev.meta)
+            meta["template_id"] = tid
+            meta["template"] = template
+            out.append(Event(ts=ev.ts, source=ev.source, level=ev.level, event_id=ev.event_id,
+                             message=ev.message, meta=meta, tags=list(ev.tags)))
         return out
 
+    def count(self, events: List[Event]) -> None:
+        """
+        Mine and count templates like assign(), without building per-event copies.
+        Use when only summary() is needed.
+        """
+        counts = self._counts
+        for ev in events:
+            template = self._template_of(ev.message)
+            self._id_for(template)
+            counts[template] = counts.get(template, 0) + 1
+
     def summary(self) -> List[Tuple[str, int, str]]:
         """
         Returns a stable list of (template_id, count, template), sorted by count desc then id.
@@ -3,7 +3,7 @@ anomaly_svm.py - Uses Linear SVM to detect anomalous log patterns
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from sklearn import svm
 from sklearn.preprocessing import StandardScaler
 from datetime import datetime
@@ -31,7 +31,8 @@ def detect_anomalies(events):
     df["outlier"] = preds
 
     # Visualize anomalies
-    fig, ax = plt.subplots(figsize=(10, 5))
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
     inliers = df[df['outlier'] == 1]
     outliers = df[df['outlier'] == -1]
 
@@ -3,7 +3,9 @@ clustering_model.py - Clustering log events using KMeans for pattern discovery
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
+# OO Figure rather than pyplot: pyplot's global figure state isn't thread-safe,
+# and the ML models run concurrently
+from matplotlib.figure import Figure
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 from datetime import datetime
@@ -34,7 +36,8 @@ def cluster_events(events):
         df['cluster'] = kmeans.fit_predict(scaled)
 
         # Generate plot using matplotlib
-        fig, ax = plt.subplots(figsize=(10, 5))
+        fig = Figure(figsize=(10, 5))
+        ax = fig.subplots()
         colors = ['red', 'green', 'blue']
         for c in df['cluster'].unique():
             subset = df[df['cluster'] == c]
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Event:
     ts: Optional[datetime]          # normalized UTC timestamp (None if unknown)
     source: str                     # e.g., "evtx:System", "msi", "text:app"
@@ -13,3 +13,10 @@ class Event:
     message: str                    # full message text
     meta: Dict[str, str] = field(default_factory=dict)   # arbitrary parsed fields
     tags: List[str] = field(default_factory=list)        # detector-assigned tags
+
+@dataclass(slots=True)
+class LogEvent:
+    timestamp: Optional[datetime]   # parsed timestamp (None if unknown)
+    component: str                  # source file stem or component name
+    message: str                    # log line text (redacted when produced by redaction)
+    severity: str = "INFO"          # upper-case INFO/WARNING/ERROR/CRITICAL
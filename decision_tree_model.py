@@ -3,7 +3,9 @@ decision_tree_model.py - Uses Decision Trees to predict severity of events
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
+# Figure, not pyplot: this model runs on worker threads next to the others
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from sklearn.tree import DecisionTreeClassifier, plot_tree
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
@@ -38,7 +40,9 @@ def analyze_event_severity(events):
     tree.fit(X_train, y_train)
 
     # Plot decision tree
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)  # plot_tree measures text with the canvas renderer
+    ax = fig.subplots()
     plot_tree(tree, feature_names=["timestamp", "component"], class_names=le_sev.classes_, filled=True, ax=ax)
     ax.set_title("Decision Tree - Severity Prediction")
 
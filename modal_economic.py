@@ -1,17 +1,24 @@
 # modal_economic.py - known-good Streamlit launcher for Modal
-import os, shlex, subprocess, threading
+import os, shlex, subprocess, threading, time
+import urllib.request
 import modal
 from modal import FilePatternMatcher
 
 APP_NAME = "logsense-streamlit"
 APP_ENTRY = "skc_log_analyzer_minimal.py"
 PORT = 8000
+HEALTH_PORT = PORT + 1   # /healthz sidecar, cheaper to probe than Streamlit itself
+HEALTH_TTL_S = 1.0       # reuse the last Streamlit health result for this long
 
 # Build a lean image and pre-bake deps. Exclude heavy stuff to cut cold-starts.
 image = (
     modal.Image.debian_slim(python_version="3.11")
     .add_local_dir(".", remote_path="/root/app")
-    .pip_install_from_requirements("/root/app/requirements-modal.txt")
+    # Wheels only: never fall back to compiling an sdist inside the image build
+    .pip_install_from_requirements(
+        "/root/app/requirements-modal.txt",
+        extra_options="--only-binary=:all: --no-cache-dir",
+    )
 )
 
 app = modal.App(name=APP_NAME, image=image)
@@ -30,6 +37,58 @@ WEB_ECON = dict(
 def health():
     return {"ok": True}
 
+def _probe(url, timeout=1.0):
+    """Return True if GET url answers 200."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+def _start_health_sidecar():
+    """Serve /healthz on HEALTH_PORT, backed by a cached Streamlit health check.
+
+    Probes (Modal's and our own wait loop) hit this no-op route instead of
+    Streamlit; Streamlit's /_stcore/health is consulted at most once per
+    HEALTH_TTL_S. Returns the /healthz URL, or None if the sidecar can't start.
+    """
+    try:
+        import uvicorn
+        from fastapi import FastAPI
+        from fastapi.responses import JSONResponse
+    except Exception as e:
+        print(f"[MODAL] Health sidecar unavailable: {e}", flush=True)
+        return None
+
+    streamlit_health = f"http://127.0.0.1:{PORT}/_stcore/health"
+    state = {"ok": False, "checked": 0.0}
+    lock = threading.Lock()
+
+    def _streamlit_ok():
+        with lock:
+            now = time.monotonic()
+            if now - state["checked"] >= HEALTH_TTL_S:
+                state["ok"] = _probe(streamlit_health)
+                state["checked"] = now
+            return state["ok"]
+
+    health_app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+    @health_app.get("/healthz")
+    def healthz():
+        if _streamlit_ok():
+            return {"status": "ok"}
+        return JSONResponse({"status": "starting"}, status_code=503)
+
+    threading.Thread(
+        target=uvicorn.run,
+        args=(health_app,),
+        kwargs=dict(host="0.0.0.0", port=HEALTH_PORT, log_level="warning"),
+        daemon=True,
+    ).start()
+    print(f"[MODAL] Health sidecar listening on :{HEALTH_PORT}/healthz", flush=True)
+    return f"http://127.0.0.1:{HEALTH_PORT}/healthz"
+
 # The UI endpoint with proper lifecycle management
 @app.function(**WEB_ECON)
 @modal.web_server(port=PORT, startup_timeout=300, label="run")
@@ -108,8 +167,9 @@ def run():
         t_err = threading.Thread(target=_reader, args=(proc.stderr, "STDERR"), daemon=True)
         t_out.start(); t_err.start()
 
-        # Wait for Streamlit to be ready by checking if port is accepting connections
-        import socket
+        # Wait for Streamlit to be ready via the /healthz sidecar (falls back to
+        # Streamlit's own health route if the sidecar could not start)
+        ready_url = _start_health_sidecar() or f"http://127.0.0.1:{PORT}/_stcore/health"
         start_time = time.time()
         streamlit_ready = False
         
@@ -118,24 +178,16 @@ def run():
                 print(f"[MODAL] Process exited early with code: {proc.returncode}", flush=True)
                 return
                 
-            # Check if Streamlit is accepting connections
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                result = sock.connect_ex(('localhost', PORT))
-                sock.close()
-                if result == 0:
-                    print(f"[MODAL] Streamlit is accepting connections after {int(time.time() - start_time)}s", flush=True)
-                    streamlit_ready = True
-                    break
-            except:
-                pass
+            if _probe(ready_url):
+                print(f"[MODAL] Streamlit is healthy after {int(time.time() - start_time)}s", flush=True)
+                streamlit_ready = True
+                break
                 
             time.sleep(2)
-            print(f"[MODAL] Waiting for Streamlit to accept connections... {int(time.time() - start_time)}s", flush=True)
+            print(f"[MODAL] Waiting for Streamlit health... {int(time.time() - start_time)}s", flush=True)
 
         if not streamlit_ready:
-            print(f"[MODAL] ERROR: Streamlit failed to accept connections after {int(time.time() - start_time)}s", flush=True)
+            print(f"[MODAL] ERROR: Streamlit failed to become healthy after {int(time.time() - start_time)}s", flush=True)
             proc.terminate()
             return
 
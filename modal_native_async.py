@@ -5,6 +5,7 @@ import os
 import sys
 import traceback
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, Any, List, Optional
 
 import modal
@@ -346,7 +347,7 @@ def async_app():
         
         # Generate summary
         total_events = len(events)
-        most_common_type = max(event_types.items(), key=lambda x: x[1]) if event_types else ("unknown", 0)
+        most_common_type = max(event_types.items(), key=itemgetter(1)) if event_types else ("unknown", 0)
         
         summary = (
             f"Analysis Summary:\n"
@@ -2,7 +2,9 @@
 import asyncio
 import os
 import tempfile
+from dataclasses import asdict
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, Any, List, Optional
 
 import modal
@@ -141,8 +143,8 @@ def economical_app():
             # Clean up temp file
             os.unlink(temp_path)
 
-            # Convert SimpleNamespace to dict for JSON serialization
-            events = [vars(e) for e in events]
+            # Convert redacted LogEvents to dicts for JSON serialization
+            events = [e if isinstance(e, dict) else asdict(e) for e in events]
             
             # Store in both caches
             session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -215,7 +217,7 @@ def economical_app():
                 
                 # Generate basic summary
                 total_events = len(events)
-                most_common_type = max(event_types.items(), key=lambda x: x[1]) if event_types else ("unknown", 0)
+                most_common_type = max(event_types.items(), key=itemgetter(1)) if event_types else ("unknown", 0)
                 
                 basic_summary = f"Analysis Summary:\n"
                 basic_summary += f"Total Events: {total_events}\n"
@@ -0,0 +1,51 @@
+"""
+rca_confidence.py - Confidence scoring for the tiered RCA engine tiers
+Pure, fully annotated functions with no engine state, so the module can be
+compiled with mypyc (`mypyc rca_confidence.py`); a built extension is picked
+up by the normal import ahead of this source file.
+"""
+
+from typing import Any, Dict, List
+
+
+def calc_rule(outcome: List[Any]) -> float:
+    """Calculate confidence for rule-based results"""
+    if not outcome:
+        return 0.1
+
+    # Higher confidence for more specific matches
+    specificity_score = min(len(outcome) * 0.2, 0.8)
+    return min(0.6 + specificity_score, 1.0)
+
+
+def calc_ml(ml_results: Dict[str, Any]) -> float:
+    """Calculate confidence for ML results"""
+    total_models = len(ml_results)
+    if total_models == 0:
+        return 0.1
+
+    valid_results = sum(1 for result in ml_results.values() if result is not None)
+    # Confidence based on model agreement
+    return min(0.5 + (valid_results / total_models) * 0.3, 0.85)
+
+
+def calc_llm(outcome: str) -> float:
+    """Calculate confidence for LLM results"""
+    if not outcome or len(outcome) < 100:
+        return 0.3
+
+    # Simple heuristic based on response completeness
+    text = outcome.lower()
+    indicators = (
+        ("root cause" in text)
+        + ("recommendation" in text)
+        + (len(outcome) > 500)
+        + ("error" in text or "critical" in text)
+    )
+    return min(0.6 + indicators * 0.1, 0.9)
+
+
+def calc_genai(outcome: str) -> float:
+    """Calculate confidence for external GenAI results"""
+    # Assume higher confidence for external AI
+    return min(calc_llm(outcome) + 0.1, 0.95)
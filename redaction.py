@@ -5,33 +5,46 @@ redaction.py - Redaction engine for masking sensitive info from logs
 import re
 import zipfile
 from io import BytesIO
-from types import SimpleNamespace
 import os
 import json
+from datamodels.events import LogEvent
+
+
+def _field(ev, name, default):
+    """Read an event field from either a parsed-log dict or an event object."""
+    if isinstance(ev, dict):
+        return ev.get(name, default)
+    return getattr(ev, name, default)
 
 class Redactor:
     def __init__(self, patterns):
         self.patterns = patterns
+        # Compiled once; re.sub() with a pattern string re-resolves it on every call
+        self._compiled = [
+            (re.compile(p["pattern"], re.IGNORECASE), p["replacement"])
+            for p in (patterns or [])
+            if isinstance(p, dict) and "pattern" in p and "replacement" in p
+        ]
 
     def redact_string(self, text):
         """Apply all redaction patterns to a single string."""
-        if not isinstance(text, str):
+        if not isinstance(text, str) or not self._compiled or not text:
             return text
-        for pattern in self.patterns:
-            if isinstance(pattern, dict) and "pattern" in pattern and "replacement" in pattern:
-                text = re.sub(pattern["pattern"], pattern["replacement"], text, flags=re.IGNORECASE)
+        for rx, replacement in self._compiled:
+            text = rx.sub(replacement, text)
         return text
 
     def redact_events(self, events):
-        """Apply redaction to all InstallEvent objects."""
+        """Apply redaction to all events (objects or parse_logs dicts)."""
         redacted = []
         for ev in events:
             redacted.append(
-                SimpleNamespace(
-                    timestamp=getattr(ev, "timestamp", None),
-                    component=self.redact_string(getattr(ev, "component", "")),
-                    message=self.redact_string(getattr(ev, "message", "")),
-                    severity=getattr(ev, "severity", "INFO"),
+                LogEvent(
+                    timestamp=_field(ev, "timestamp", None),
+                    component=self.redact_string(_field(ev, "component", "")),
+                    message=self.redact_string(_field(ev, "message", "")),
+                    # Normalised once here so downstream filters compare exact strings
+                    severity=str(_field(ev, "severity", None) or "INFO").upper(),
                 )
             )
         return redacted
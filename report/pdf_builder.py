@@ -1,6 +1,6 @@
 # report/pdf_builder.py
 from __future__ import annotations
-from typing import Dict, Any, List
+from typing import Dict, Any, List, BinaryIO, Union
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
@@ -31,7 +31,8 @@ def _bullets(c: canvas.Canvas, x: float, y: float, items: List[str], max_items:
     return y
 
 
-def build_pdf(report: Dict[str, Any], out_path: str, include_annexes: bool = True) -> str:
+def build_pdf(report: Dict[str, Any], out_path: Union[str, BinaryIO], include_annexes: bool = True) -> Union[str, BinaryIO]:
+    """Render the one-pager to out_path, a file path or a writable binary buffer."""
     c = canvas.Canvas(out_path, pagesize=A4)
     width, height = A4
     x, y = inch * 0.75, height - inch * 0.75
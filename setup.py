@@ -7,11 +7,18 @@ import json
 import yaml
 import streamlit as st
 
+try:
+    import orjson
+    _jloads = orjson.loads
+except ImportError:  # stdlib fallback
+    _jloads = json.loads
+
 # === Configurable Paths ===
 CONFIG_PATH = "config"
 PLANS_PATH = "plans"
 DEFAULT_PLAN = "dash_test_plan.json"
 SOFTPAQ_PLAN = "softpaq_test_plan.json"
+MAX_JSON_BYTES = 50_000_000  # refuse larger config/plan payloads
 # API key should be loaded from environment variables in production
 # PRIVATE_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
@@ -22,8 +29,12 @@ def load_json_file(path):
     if not os.path.exists(path):
         return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            data = f.read(MAX_JSON_BYTES + 1)
+        if len(data) > MAX_JSON_BYTES:
+            print(f"Warning: JSON file {path} exceeds {MAX_JSON_BYTES} bytes; skipping")
+            return None
+        return _jloads(data)
     except (json.JSONDecodeError, IOError, UnicodeDecodeError) as e:
         print(f"Warning: Failed to load JSON file {path}: {e}")
         return None
@@ -78,11 +89,19 @@ def get_test_plan_by_name(name):
     """Alias for get_test_plan to maintain compatibility with older app references."""
     return get_test_plan(name)
 
+# Directory listing cache, invalidated when PLANS_PATH's mtime changes
+_plans_cache = {"mtime": None, "val": []}
+
 def get_available_test_plans():
     """Return list of available test plans from the /plans directory."""
-    if not os.path.exists(PLANS_PATH):
+    try:
+        mtime = os.stat(PLANS_PATH).st_mtime
+    except FileNotFoundError:
         return []
-    return [f for f in os.listdir(PLANS_PATH) if f.endswith((".json", ".yaml", ".yml"))]
+    if mtime != _plans_cache["mtime"]:
+        _plans_cache["val"] = [f for f in os.listdir(PLANS_PATH) if f.endswith((".json", ".yaml", ".yml"))]
+        _plans_cache["mtime"] = mtime
+    return list(_plans_cache["val"])
 
 def load_custom_test_plan(file_obj):
     """Load user-uploaded test plan with robust error handling."""
@@ -90,7 +109,11 @@ def load_custom_test_plan(file_obj):
         return None
     try:
         if file_obj.name.endswith(".json"):
-            return json.load(file_obj)
+            data = file_obj.read(MAX_JSON_BYTES + 1)
+            if len(data) > MAX_JSON_BYTES:
+                print(f"Warning: Uploaded plan {file_obj.name} exceeds {MAX_JSON_BYTES} bytes")
+                return None
+            return _jloads(data)
         elif file_obj.name.endswith((".yaml", ".yml")):
             return yaml.safe_load(file_obj)
         else:
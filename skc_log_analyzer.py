@@ -1,41 +1,58 @@
 # Streamlit UI and orchestration for LogSense (Enhanced Corporate UX)
 
 import os
+import sys
+import threading
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
 os.environ["STREAMLIT_WATCHER_TYPE"] = "none"
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import zipfile, io
 from io import BytesIO
 from dotenv import load_dotenv
-import tempfile
 from datetime import datetime
 import hashlib
-
-# Analysis modules
-from analysis.templates import TemplateExtractor
-from report.pdf_builder import build_pdf as build_onepager_pdf
-from analysis.event_chain import ChainSpec, detect_sequences
-from analysis.session import correlate_start_end
-from datamodels.events import Event as CanonEvent
-
-# Core modules
+import re
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from collections import OrderedDict
+try:
+    import xxhash  # optional: much faster than hashlib for upload dedupe keys
+except ImportError:
+    xxhash = None
+try:
+    from isal import isal_zlib  # optional: ISA-L inflate is 2-3x faster than stock zlib
+except ImportError:
+    isal_zlib = None
+
+
+def _open_zip_member(zip_ref, name):
+    """Open an uploaded ZIP member, inflating deflated members with ISA-L when available.
+
+    Only this member's decompressor is replaced (before any data is read), so
+    zipfile's module-level zlib - and every ZIP this process writes - is untouched.
+    """
+    member = zip_ref.open(name)
+    if isal_zlib is not None and member._compress_type == zipfile.ZIP_DEFLATED:
+        member._decompressor = isal_zlib.decompressobj(-15)
+    return member
+
+# Core modules (tab-specific modules are imported where they are used, so
+# first paint and widget reruns don't pay for them)
 import analysis
 import redaction
-import test_plan
-import charts
-import recommendations
-import ai_rca
-import report
 import setup
 # Lazy load heavy ML modules to avoid memory issues at startup
 clustering_model = None
 decision_tree_model = None
 anomaly_svm = None
-from rca_rules import get_all_rca_summaries
-
-# Advanced analytics - lazy load to avoid heavy ML imports at startup
-AdvancedAnalyticsEngine = None
 
 # UI Components
 from ui_components import (
@@ -54,6 +71,7 @@ def _to_dt(obj):
         return None
 
 def adapt_events_to_canonical(evts):
+    from datamodels.events import Event as CanonEvent
     canon = []
     for ev in evts:
         ts = _to_dt(getattr(ev, 'timestamp', None))
@@ -64,6 +82,66 @@ def adapt_events_to_canonical(evts):
                                 event_id=None, message=str(msg), meta={}, tags=[]))
     return canon
 
+def _canonical_events():
+    """adapt_events_to_canonical(redacted_events), computed once per upload.
+
+    The Templates, Correlations and Executive Summary sections all need the
+    canonical list; keying it on the upload hash keeps widget reruns from
+    rebuilding it.
+    """
+    key = st.session_state.get("uploaded_file_hash")
+    cached = st.session_state.get("canon_events")
+    if cached is None or cached[0] != key:
+        cached = (key, adapt_events_to_canonical(st.session_state.get("redacted_events", [])))
+        st.session_state["canon_events"] = cached
+    return cached[1]
+
+CHAT_WINDOW_EVENTS = 50
+# A question mentioning any of these pulls matching recent events into the chat context
+_CHAT_KEYWORDS = frozenset(("error", "warning", "fail", "critical", "timeout", "crash", "exception"))
+
+def _chat_window(events_df):
+    """Last CHAT_WINDOW_EVENTS redacted events, their case-folded text and a
+    question words -> matching positions memo.
+
+    Each haystack is ``message + "\x1f" + component``, lowercased once per
+    upload from the events frame, so a chat turn is one vectorised regex
+    search. Word sets already asked about are answered from the memo
+    without scanning.
+    """
+    key = st.session_state.get("uploaded_file_hash")
+    cached = st.session_state.get("chat_window")
+    if cached is None or cached[0] != key:
+        window = st.session_state.get("redacted_events", [])[-CHAT_WINDOW_EVENTS:]
+        tail = events_df.iloc[-CHAT_WINDOW_EVENTS:]
+        haystacks = (tail["message"].astype(str) + "\x1f" + tail["component"].astype(str)).str.lower()
+        cached = (key, window, haystacks, {})
+        st.session_state["chat_window"] = cached
+    return cached[1], cached[2], cached[3]
+
+CHAT_CACHE_SIZE = 32
+
+def _chat_cache_key(mode, prompt, ai_summary):
+    """Chat replies depend on the mode, the question, the upload and the report summary."""
+    material = f"{mode}|{prompt}|{st.session_state.get('uploaded_file_hash')}|{ai_summary}"
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+def _chat_cache_get(key):
+    """Cached chat reply for key (refreshing its LRU position), or None."""
+    cache = st.session_state.setdefault("chat_cache", OrderedDict())
+    reply = cache.get(key)
+    if reply is not None:
+        cache.move_to_end(key)
+    return reply
+
+def _chat_cache_put(key, reply):
+    """Remember a chat reply, evicting the least recently used past CHAT_CACHE_SIZE."""
+    cache = st.session_state.setdefault("chat_cache", OrderedDict())
+    cache[key] = reply
+    cache.move_to_end(key)
+    while len(cache) > CHAT_CACHE_SIZE:
+        cache.popitem(last=False)
+
 # Load environment variables
 load_dotenv()
 
@@ -92,15 +170,243 @@ engines, analysis_settings = render_sidebar_config()
 use_python_eng = engines["python"]
 use_local_llm = engines["local_llm"]
 use_cloud_ai = engines["cloud_ai"]
+if st.sidebar.button("Clear cache", help="Drop cached parse results to free server memory."):
+    st.cache_data.clear()
 
 # Cached helpers
-@st.cache_data(show_spinner=False)
-def _hash_bytes(b: bytes) -> str:
-    return hashlib.sha256(b or b"").hexdigest()
+def _hash_upload(fobj, chunk_size: int = 1 << 20) -> str:
+    """Hash an uploaded file in fixed-size chunks and rewind it.
+
+    Only used as a session-state cache key, so collision resistance is not needed.
+    """
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    fobj.seek(0)
+    for chunk in iter(lambda: fobj.read(chunk_size), b""):
+        hasher.update(chunk)
+    fobj.seek(0)
+    return hasher.hexdigest()
+
+# parse_logs is pure Python and holds the GIL, so multi-file archives are
+# parsed in worker processes once there is enough text to repay the startup.
+PARALLEL_PARSE_MIN_BYTES = 4 * 1024 * 1024
+# Files larger than this are decoded line by line rather than read whole
+STREAM_PARSE_BYTES = 10 * 1024 * 1024
+
+def _parse_binary_stream(raw, fname):
+    """Decode a binary file object line by line and parse it."""
+    text_stream = io.TextIOWrapper(raw, encoding='utf-8', errors='ignore')
+    try:
+        return analysis.parse_logs_stream(text_stream, fname=fname)
+    finally:
+        text_stream.detach()  # leave the underlying file open for the caller
+
+def _parse_payloads(payloads, file_hash):
+    """Parse [(file_name, text), ...] from one upload into one event list per payload, in order."""
+    total = sum(len(content) for _, content in payloads)
+    if len(payloads) < 2 or total < PARALLEL_PARSE_MIN_BYTES:
+        return [_parse_logs_cached(file_hash, name, content) for name, content in payloads]
+    workers = min(len(payloads), os.cpu_count() or 1)
+    # spawn, not fork: the Streamlit server process is multi-threaded
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as ex:
+        return list(ex.map(analysis.parse_logs, [c for _, c in payloads], [n for n, _ in payloads]))
+
+# Severities are upper-cased once at redaction time; compare against these sets
+ERR_SEVERITIES = frozenset(("ERROR", "CRITICAL"))
+ISSUE_SEVERITIES = ERR_SEVERITIES | {"WARNING"}
+
+def _build_events_frame(evts):
+    """Columnar view of the redacted events, built once per upload.
+
+    Metrics, filters and sorts run on this frame instead of re-walking the
+    event objects on every rerun.
+    """
+    return pd.DataFrame({
+        "timestamp": pd.to_datetime([ev.timestamp for ev in evts], errors="coerce"),
+        "component": pd.Categorical([ev.component for ev in evts]),
+        "severity": pd.Categorical([ev.severity for ev in evts]),
+        "message": [ev.message for ev in evts],
+    })
+
+@st.cache_resource(show_spinner=False)
+def _get_template_extractor():
+    """Process-wide TemplateExtractor plus the lock guarding it.
+
+    The extractor accumulates counts, so callers hold the lock and reset()
+    it before each assign()/summary() run.
+    """
+    from analysis.templates import TemplateExtractor
+    return TemplateExtractor(), threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def _get_analytics_engine():
+    """Process-wide AdvancedAnalyticsEngine (stateless between runs)."""
+    sys.path.append(os.path.join(os.path.dirname(__file__), 'Python Modules'))
+    from analyzer.advanced_analytics import AdvancedAnalyticsEngine
+    return AdvancedAnalyticsEngine()
+
+def _earliest_rows(df, n):
+    """First n rows of the events frame by timestamp (ties in row order, NaT last).
+
+    Uses argpartition on the int64 timestamps, so only n rows are sorted.
+    """
+    ts = df["timestamp"].to_numpy().view("i8").copy()
+    ts[df["timestamp"].isna().to_numpy()] = np.iinfo(np.int64).max
+    idx = np.arange(len(ts)) if len(ts) <= n else np.argpartition(ts, n)[:n]
+    idx = idx[np.lexsort((idx, ts[idx]))]
+    return df.iloc[idx]
+
+def _top_counts(values, k):
+    """[(value, count), ...] for the k most frequent values, via np.unique."""
+    if len(values) == 0:
+        return []
+    uniq, counts = np.unique(np.asarray(values, dtype=object), return_counts=True)
+    order = np.argsort(-counts, kind="stable")[:k]
+    return [(uniq[i], int(counts[i])) for i in order]
+
+def _severity_stats(df):
+    """Severity counts, top error components, error counts per hour of day
+    and the last ten error rows, computed once per upload.
+
+    Metric cards, report insights and the chat fallback read these instead
+    of re-filtering.
+    """
+    counts = df["severity"].value_counts()
+    n = lambda sev: int(counts.get(sev, 0))
+    err_mask = df["severity"].isin(ERR_SEVERITIES).to_numpy()
+    err_hours = df["timestamp"][err_mask].dropna().dt.hour.to_numpy()
+    return {
+        "critical": n("CRITICAL"),
+        "errors": n("ERROR") + n("CRITICAL"),
+        "warnings": n("WARNING"),
+        "issues": n("ERROR") + n("CRITICAL") + n("WARNING"),
+        "top_err_components": _top_counts(df["component"].to_numpy()[err_mask].astype(str), 3),
+        "err_hour_counts": np.bincount(err_hours, minlength=24),
+        "err_tail": np.flatnonzero(err_mask)[-10:],
+    }
 
-@st.cache_data(show_spinner=False)
-def _parse_logs_cached(content: str, fname: str):
-    return analysis.parse_logs(content, fname=fname)
+# Streamlit >= 1.52 accepts a callable for download_button(data=...) and only
+# calls it on click; older releases re-register the bytes on every rerun.
+_DEFERRED_DOWNLOADS = tuple(int(p) for p in st.__version__.split(".")[:2]) >= (1, 52)
+
+# Generated reports on disk across all sessions; the oldest are deleted past this
+ARTIFACT_DIR_MAX_BYTES = 512 * 1024 * 1024
+
+@st.cache_resource(show_spinner=False)
+def _artifact_dir():
+    """Directory for every session's generated reports, removed when the server exits."""
+    path = tempfile.mkdtemp(prefix="logsense_")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+def _prune_artifacts(root, incoming):
+    """Delete the oldest reports until `incoming` more bytes fit under the cap."""
+    files = []
+    for entry in os.scandir(root):
+        try:
+            info = entry.stat()
+        except OSError:
+            continue
+        files.append((info.st_mtime, info.st_size, entry.path))
+    total = sum(size for _, size, _ in files) + incoming
+    for _, size, path in sorted(files):
+        if total <= ARTIFACT_DIR_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+def _drop_artifacts(keys):
+    """Forget these session reports and delete their files."""
+    for key in keys:
+        path = st.session_state.pop(key, None)
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _save_artifact(key, data):
+    """Write a generated report to the shared artifact dir and return its path.
+
+    Session state then holds a short path instead of the PDF bytes. A report
+    replaced or invalidated in its session is deleted; reports of abandoned
+    sessions age out under ARTIFACT_DIR_MAX_BYTES.
+    """
+    root = _artifact_dir()
+    os.makedirs(root, exist_ok=True)
+    _drop_artifacts((key,))
+    _prune_artifacts(root, len(data))
+    fd, path = tempfile.mkstemp(prefix=f"{key}_", suffix=".pdf", dir=root)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+def _download_data(path):
+    """download_button payload for a saved report; read on click where supported."""
+    if _DEFERRED_DOWNLOADS:
+        return lambda: Path(path).read_bytes()
+    return Path(path).read_bytes()
+
+@st.cache_resource(show_spinner=False)
+def _get_report_pool():
+    """Worker threads for report/AI generation, shared by all sessions."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="logsense-report")
+
+def _events_table(df, max_msg=None):
+    """Turn a slice of the events frame into the Timestamp/Component/Severity/Message table."""
+    msgs = df["message"]
+    if max_msg:
+        long_msgs = msgs.str.len() > max_msg
+        msgs = msgs.where(~long_msgs, msgs.str.slice(0, max_msg) + "...")
+    return pd.DataFrame({
+        "Timestamp": df["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S").fillna("").to_numpy(),
+        "Component": df["component"].astype(str).to_numpy(),
+        "Severity": df["severity"].astype(str).to_numpy(),
+        "Message": msgs.to_numpy(),
+    })
+
+# Bounded so a long-running server doesn't pin every upload's events forever
+@st.cache_data(show_spinner=False, max_entries=8, ttl=3600)
+def _parse_logs_cached(file_hash: str, fname: str, _content: str):
+    # Keyed on (upload hash, file name); the leading underscore tells Streamlit
+    # not to hash the multi-MB content on every lookup
+    return analysis.parse_logs(_content, fname=fname)
+
+@st.cache_data(show_spinner=False, max_entries=8, ttl=3600)
+def _onepager_payload(file_hash: str, build: str, platform: str, app_version: str, _events_df):
+    """Executive-summary report dict, keyed on the upload hash and header fields.
+
+    events_df rows line up with the canonical events, so evidence is sliced
+    from the columns instead of rebuilt per object.
+    """
+    ts_all = _events_df["timestamp"]
+    first_ts = str(ts_all.iloc[0]) if len(ts_all) and pd.notna(ts_all.iloc[0]) else ""
+    last_ts = str(ts_all.iloc[-1]) if len(ts_all) and pd.notna(ts_all.iloc[-1]) else ""
+    head = _events_df.head(250)
+    # Events without a component are attributed to "text", as the per-event path did
+    component = head["component"]
+    source = component.astype(str).where(component.notna() & (component != ""), "text")
+    evidence = pd.DataFrame({
+        "ts": head["timestamp"].astype(str).where(head["timestamp"].notna(), ""),
+        "source": source,
+        "level": head["severity"].astype(str),
+        "event_id": None,
+        "message": head["message"],
+    }).to_dict("records")
+    return {
+        "meta": {
+            "build": build,
+            "platform": platform,
+            "versions": {"app": app_version},
+            "ts_range": f"{first_ts} .. {last_ts}",
+        },
+        "deltas": {"new": [], "resolved": [], "persisting": []},
+        "observations": {"spikes": [], "gaps": [], "first_seen": [], "clock_anomalies": []},
+        "rca": {"root_causes": [], "next_actions": [], "confidence": 0.0},
+        "evidence": evidence,
+    }
 
 # --- Welcome Screen ---
 if "show_welcome" not in st.session_state:
@@ -183,19 +489,14 @@ with st.expander("Log File Upload", expanded=True):
         st.session_state["current_step"] = 1
 
         # Compute content hash to avoid reprocessing unchanged file(s)
-        try:
-            uploaded_bytes = uploaded_file.getvalue()
-        except Exception:
-            # Fallback if getvalue not available (ZIP streaming), read via buffer
-            uploaded_bytes = uploaded_file.read()
-        file_hash = _hash_bytes(uploaded_bytes)
+        file_hash = _hash_upload(uploaded_file)
 
         if st.session_state.get("uploaded_file_hash") != file_hash:
             with st.spinner("Processing uploaded files..."):
                 events_new = []
                 files_processed = 0
                 if uploaded_file.name.endswith('.zip'):
-                    with zipfile.ZipFile(io.BytesIO(uploaded_bytes), 'r') as zip_ref:
+                    with zipfile.ZipFile(uploaded_file, 'r') as zip_ref:
                         zip_contents = zip_ref.namelist()
                         log_files = [f for f in zip_contents if f.endswith(('.txt', '.log'))]
 
@@ -205,15 +506,29 @@ with st.expander("Log File Upload", expanded=True):
                             ""
                         )
 
-                        for file_name in log_files:
-                            with zip_ref.open(file_name) as file:
-                                content = file.read().decode('utf-8', errors='ignore')
-                                file_events = _parse_logs_cached(content, fname=file_name)
-                                events_new.extend(file_events)
+                        # ZipFile reads stay on this thread; only parsing fans out.
+                        # Large entries are streamed here instead of being read whole.
+                        # Each member's events go to its slot, keeping archive order
+                        # (chat context, evidence and time range depend on it).
+                        parts = [None] * len(log_files)
+                        payloads, payload_slots = [], []
+                        for i, file_name in enumerate(log_files):
+                            with _open_zip_member(zip_ref, file_name) as file:
+                                if zip_ref.getinfo(file_name).file_size > STREAM_PARSE_BYTES:
+                                    parts[i] = _parse_binary_stream(file, file_name)
+                                else:
+                                    payloads.append((file_name, file.read().decode('utf-8', errors='ignore')))
+                                    payload_slots.append(i)
+                        for i, member_events in zip(payload_slots, _parse_payloads(payloads, file_hash)):
+                            parts[i] = member_events
+                        events_new = list(chain.from_iterable(parts))
                         files_processed = len(log_files)
                 else:
-                    content = uploaded_bytes.decode('utf-8', errors='ignore')
-                    events_new = _parse_logs_cached(content, fname=uploaded_file.name)
+                    if uploaded_file.size > STREAM_PARSE_BYTES:
+                        events_new = _parse_binary_stream(uploaded_file, uploaded_file.name)
+                    else:
+                        content = uploaded_file.read().decode('utf-8', errors='ignore')
+                        events_new = _parse_logs_cached(file_hash, uploaded_file.name, content)
                     files_processed = 1
 
             st.session_state["events"] = events_new
@@ -228,10 +543,13 @@ with st.expander("Log File Upload", expanded=True):
 
             st.session_state["redacted_events"] = red_evts
             st.session_state["redacted_metadata"] = red_meta
+            events_df_new = st.session_state["events_df"] = _build_events_frame(red_evts)
+            st.session_state["severity_stats"] = _severity_stats(events_df_new)
             st.session_state["uploaded_file_hash"] = file_hash
 
             # Invalidate dependent artifacts
-            for k in ("ai_summary_local", "ai_summary_cloud", "pdf_standard", "pdf_local_ai", "pdf_cloud_ai"):
+            _drop_artifacts(("pdf_standard", "pdf_local_ai", "pdf_cloud_ai"))
+            for k in ("ai_summary_local", "ai_summary_cloud", "pending_reports", "insights_cache", "chat_cache", "pending_chat"):
                 st.session_state.pop(k, None)
 
             redacted_events = red_evts
@@ -245,15 +563,21 @@ with st.expander("Log File Upload", expanded=True):
 if redacted_events:
     st.session_state["current_step"] = 3
     
+    events_df = st.session_state.get("events_df")
+    if events_df is None:
+        events_df = st.session_state["events_df"] = _build_events_frame(redacted_events)
+    stats = st.session_state.get("severity_stats")
+    if stats is None:
+        stats = st.session_state["severity_stats"] = _severity_stats(events_df)
+
     # Key metrics
-    issues = [ev for ev in redacted_events if ev.severity in ["ERROR", "CRITICAL", "WARNING"]]
-    st.session_state["issues_found"] = len(issues)
+    st.session_state["issues_found"] = stats["issues"]
     
     render_metric_cards({
-        "Total Events": len(redacted_events),
-        "Issues Found": len(issues),
+        "Total Events": len(events_df),
+        "Issues Found": stats["issues"],
         "Files Processed": st.session_state["files_processed"],
-        "Critical Errors": len([ev for ev in issues if ev.severity == "CRITICAL"])
+        "Critical Errors": stats["critical"]
     })
 
     # Build user context for AI
@@ -305,6 +629,7 @@ if redacted_events:
                     plan_data = setup.get_test_plan(selected_plan_file)
                     if plan_data:
                         friendly_name = plan_labels.get(selected_plan_file, selected_plan_file)
+                        import test_plan
                         rich_result = test_plan.validate_plan(plan_data, events, plan_name=friendly_name)
                         st.session_state["validation_result"] = rich_result
                         # Render compact table view
@@ -341,24 +666,14 @@ if redacted_events:
     st.subheader("Timeline & Issues Analysis")
     
     # Timeline
-    timeline_events = sorted(redacted_events, key=lambda x: x.timestamp)[:50]  # Show first 50
-    timeline_df = pd.DataFrame([{
-        "Timestamp": str(ev.timestamp),
-        "Component": ev.component,
-        "Severity": ev.severity,
-        "Message": ev.message[:100] + "..." if len(ev.message) > 100 else ev.message
-    } for ev in timeline_events])
+    timeline_events = _earliest_rows(events_df, 50)  # Show first 50
+    timeline_df = _events_table(timeline_events, max_msg=100)
     
     render_data_table(timeline_df, "Event Timeline")
 
     # Issues Summary
-    if issues:
-        issues_df = pd.DataFrame([{
-            "Timestamp": str(ev.timestamp),
-            "Component": ev.component,
-            "Severity": ev.severity,
-            "Message": ev.message
-        } for ev in issues])
+    if stats["issues"]:
+        issues_df = _events_table(events_df[events_df["severity"].isin(ISSUE_SEVERITIES)])
         render_data_table(issues_df, "Errors and Warnings")
     else:
         render_info_card("No Issues Found", "No warnings or errors detected in the logs.", "", "#d4edda")
@@ -380,12 +695,15 @@ if redacted_events:
                 "#f8f9fa"
             )
             with st.spinner("Mining templates..."):
-                canon_all = adapt_events_to_canonical(redacted_events)
-                tmpl = TemplateExtractor()
-                assigned = tmpl.assign(canon_all)
-                summary_rows = tmpl.summary()
+                canon_all = _canonical_events()
+                tmpl, tmpl_lock = _get_template_extractor()
+                with tmpl_lock:
+                    tmpl.reset()
+                    tmpl.count(canon_all)
+                    summary_rows = tmpl.summary()
             if summary_rows:
-                tmpl_df = pd.DataFrame([{ "Template ID": tid, "Count": cnt, "Template": tpl } for tid, cnt, tpl in summary_rows])
+                tids, counts, tpls = zip(*summary_rows)
+                tmpl_df = pd.DataFrame({"Template ID": tids, "Count": counts, "Template": tpls})
                 render_data_table(tmpl_df, "Template Analysis")
 
     with tab_ml:
@@ -453,7 +771,9 @@ if redacted_events:
                 "#f8f9fa"
             )
             with st.spinner("Detecting common sequences and sessions..."):
-                canon_all = adapt_events_to_canonical(redacted_events)
+                from analysis.event_chain import ChainSpec, detect_sequences
+                from analysis.session import correlate_start_end
+                canon_all = _canonical_events()
                 spec = ChainSpec(steps=[{"level": "WARN"}, {"level": "ERROR"}], window_sec=300)
                 chain_hits = detect_sequences(canon_all, spec, label="WARN->ERROR")
                 sessions = correlate_start_end(canon_all, start_contains="Action start", end_contains="Action ended", correlate_key="msi_action")
@@ -462,28 +782,30 @@ if redacted_events:
             with col1:
                 st.markdown("**Sequence Hits**")
                 if chain_hits:
-                    seq_rows = [{
-                        "Label": h.label,
-                        "Start": str(h.start),
-                        "End": str(h.end),
-                        "Span (s)": (h.end - h.start).total_seconds(),
-                        "Len": len(h.indices),
-                    } for h in chain_hits[:50]]
-                    render_data_table(pd.DataFrame(seq_rows), "Sequences")
+                    hits = chain_hits[:50]
+                    seq_df = pd.DataFrame({
+                        "Label": [h.label for h in hits],
+                        "Start": [str(h.start) for h in hits],
+                        "End": [str(h.end) for h in hits],
+                        "Span (s)": [(h.end - h.start).total_seconds() for h in hits],
+                        "Len": [len(h.indices) for h in hits],
+                    })
+                    render_data_table(seq_df, "Sequences")
                 else:
                     st.info("No sequence patterns matched.")
             
             with col2:
                 st.markdown("**Sessions**")
                 if sessions:
-                    ses_rows = [{
-                        "Key": s.key,
-                        "Start": str(s.start),
-                        "End": (str(s.end) if s.end else ""),
-                        "Duration (s)": (s.duration_sec if s.duration_sec is not None else ""),
-                        "Source": s.source,
-                    } for s in sessions[:50]]
-                    render_data_table(pd.DataFrame(ses_rows), "Sessions")
+                    top_sessions = sessions[:50]
+                    ses_df = pd.DataFrame({
+                        "Key": [s.key for s in top_sessions],
+                        "Start": [str(s.start) for s in top_sessions],
+                        "End": [(str(s.end) if s.end else "") for s in top_sessions],
+                        "Duration (s)": [(s.duration_sec if s.duration_sec is not None else "") for s in top_sessions],
+                        "Source": [s.source for s in top_sessions],
+                    })
+                    render_data_table(ses_df, "Sessions")
                 else:
                     st.info("No start/end session pairs detected.")
 
@@ -527,30 +849,21 @@ if redacted_events:
             st.session_state["active_report_mode"] = selected_action
 
         # Build analytical insights for Standard Report with Advanced Analytics
-        def _build_python_insights(evts):
+        def _build_python_insights(evts, events_df, stats):
             recs = []
             try:
-                # Lazy load advanced analytics engine
-                global AdvancedAnalyticsEngine
-                if AdvancedAnalyticsEngine is None:
-                    import sys
-                    import os
-                    sys.path.append(os.path.join(os.path.dirname(__file__), 'Python Modules'))
-                    from analyzer.advanced_analytics import AdvancedAnalyticsEngine as _AdvancedAnalyticsEngine
-                    AdvancedAnalyticsEngine = _AdvancedAnalyticsEngine
-                
-                # Initialize advanced analytics engine
-                analytics_engine = AdvancedAnalyticsEngine()
+                # Shared advanced analytics engine (loaded on first use)
+                analytics_engine = _get_analytics_engine()
                 
                 # Run comprehensive analysis
                 advanced_results = analytics_engine.run_comprehensive_analysis(evts)
                 
                 # Basic KPIs
                 total = len(evts)
-                errs = [e for e in evts if getattr(e, "severity", "").upper() in ("ERROR", "CRITICAL")]
-                warns = [e for e in evts if getattr(e, "severity", "").upper() == "WARNING"]
+                # Severity filters run on the columnar frame, not the event objects
+                errs = events_df[events_df["severity"].isin(ERR_SEVERITIES).to_numpy()]
                 recs.append({"severity": "INFO", "message": f"Total events: {total}"})
-                recs.append({"severity": "INFO", "message": f"Errors/Critical: {len(errs)} | Warnings: {len(warns)}"})
+                recs.append({"severity": "INFO", "message": f"Errors/Critical: {stats['errors']} | Warnings: {stats['warnings']}"})
 
                 # Advanced Analytics Results
                 if 'key_insights' in advanced_results:
@@ -615,8 +928,7 @@ if redacted_events:
                 # Fallback to basic analysis if advanced fails
                 if not any('Advanced Analysis:' in r.get('message', '') for r in recs):
                     # Top error components (fallback)
-                    from collections import Counter
-                    top_comps = Counter([getattr(e, "component", "") for e in errs]).most_common(3)
+                    top_comps = stats["top_err_components"]
                     if top_comps:
                         recs.append({
                             "severity": "INFO",
@@ -624,7 +936,7 @@ if redacted_events:
                         })
 
                     # Most frequent ERROR message (fallback)
-                    msg_counts = Counter([getattr(e, "message", "").strip()[:120] for e in errs if getattr(e, "message", "")]).most_common(1)
+                    msg_counts = _top_counts([m.strip()[:120] for m in errs["message"] if m], 1)
                     if msg_counts:
                         recs.append({
                             "severity": "WARNING",
@@ -633,19 +945,22 @@ if redacted_events:
 
                 # Time range analysis
                 try:
-                    ts_sorted = sorted([e.timestamp for e in evts if getattr(e, "timestamp", None)])
-                    if ts_sorted:
-                        start, end = ts_sorted[0], ts_sorted[-1]
+                    ts_all = events_df["timestamp"].dropna()
+                    if not ts_all.empty:
+                        start, end = ts_all.min(), ts_all.max()
                         recs.append({"severity": "INFO", "message": f"Time range: {start} .. {end}"})
-                    hour_counts = Counter([getattr(e.timestamp, 'hour', None) for e in errs if getattr(e, 'timestamp', None) is not None])
-                    if hour_counts:
-                        peak_hour, peak_cnt = max(hour_counts.items(), key=lambda x: x[1])
+                    hour_counts = stats["err_hour_counts"]
+                    if hour_counts.any():
+                        peak_hour = int(hour_counts.argmax())
+                        peak_cnt = int(hour_counts[peak_hour])
                         recs.append({"severity": "WARNING", "message": f"Error spike around {peak_hour:02d}:00 ({peak_cnt} events)"})
                 except Exception:
                     pass
 
-                # RCA rule summaries
+                # RCA rule summaries (run once per upload: the whole result of
+                # this builder is memoised in insights_cache)
                 try:
+                    from rca_rules import get_all_rca_summaries
                     rca_list = get_all_rca_summaries(evts)
                     for item in (rca_list or [])[:3]:  # Reduced to 3 to make room for advanced analytics
                         if isinstance(item, dict):
@@ -663,72 +978,95 @@ if redacted_events:
                 
             return recs
 
-        if selected_action == "no_ai":
-            with st.spinner("Generating standard report..."):
-                py_insights = _build_python_insights(redacted_events)
-                pdf = report.generate_pdf(
-                    redacted_events,
-                    redacted_metadata,
-                    st.session_state.get("validation_result", {}),
-                    py_insights,
-                    user_name=user_name,
-                    app_name=app_name,
-                    ai_summary=None,
-                    user_context=user_context,
-                )
-                st.session_state["pdf_standard"] = pdf
-        
-        elif selected_action == "local_ai":
-            with st.spinner("Generating AI summary using Local LLM..."):
-                ai_summary = ai_rca.analyze_with_ai(redacted_events, redacted_metadata, [], user_context, offline=True)
-                st.session_state["ai_summary_local"] = ai_summary
-                pdf = report.generate_pdf(redacted_events, redacted_metadata, st.session_state.get("validation_result", {}), {}, user_name=user_name, app_name=app_name, ai_summary=ai_summary, user_context=user_context)
-                st.session_state["pdf_local_ai"] = pdf
-            st.session_state["active_report_mode"] = "local_ai"
-
-        elif selected_action == "cloud_ai":
-            with st.spinner("Generating AI summary using OpenAI..."):
-                ai_summary = ai_rca.analyze_with_ai(redacted_events, redacted_metadata, [], user_context, offline=False)
-                st.session_state["ai_summary_cloud"] = ai_summary
-                pdf = report.generate_pdf(redacted_events, redacted_metadata, st.session_state.get("validation_result", {}), {}, user_name=user_name, app_name=app_name, ai_summary=ai_summary, user_context=user_context)
-                st.session_state["pdf_cloud_ai"] = pdf
-            st.session_state["active_report_mode"] = "cloud_ai"
+        # Report jobs run on the shared pool; they must not touch st.* or session
+        # state, so everything they need is captured here on the script thread.
+        validation_result = st.session_state.get("validation_result", {})
+        # Insights depend only on the upload, so repeat clicks reuse them
+        insights_cache = st.session_state.setdefault("insights_cache", {})
+        events_fingerprint = st.session_state.get("uploaded_file_hash")
+
+        def _standard_report_job():
+            import report
+            py_insights = insights_cache.get(events_fingerprint) if events_fingerprint else None
+            if py_insights is None:
+                py_insights = _build_python_insights(redacted_events, events_df, stats)
+                if events_fingerprint:
+                    insights_cache[events_fingerprint] = py_insights
+            pdf = report.generate_pdf(
+                redacted_events,
+                redacted_metadata,
+                validation_result,
+                py_insights,
+                user_name=user_name,
+                app_name=app_name,
+                ai_summary=None,
+                user_context=user_context,
+            )
+            return pdf, None
+
+        def _ai_report_job(offline):
+            import ai_rca, report
+            ai_summary = ai_rca.analyze_with_ai(redacted_events, redacted_metadata, [], user_context, offline=offline)
+            pdf = report.generate_pdf(redacted_events, redacted_metadata, validation_result, {}, user_name=user_name, app_name=app_name, ai_summary=ai_summary, user_context=user_context)
+            return pdf, ai_summary
+
+        # action -> (pdf key, AI summary key, job, progress label)
+        report_jobs = {
+            "no_ai": ("pdf_standard", None, _standard_report_job, "standard report"),
+            "local_ai": ("pdf_local_ai", "ai_summary_local", lambda: _ai_report_job(True), "Local LLM report"),
+            "cloud_ai": ("pdf_cloud_ai", "ai_summary_cloud", lambda: _ai_report_job(False), "OpenAI report"),
+        }
+
+        # Clicking another mode while one is running queues it alongside instead of waiting
+        pending_reports = st.session_state.setdefault("pending_reports", {})
+        if selected_action in report_jobs and selected_action not in pending_reports:
+            pending_reports[selected_action] = _get_report_pool().submit(report_jobs[selected_action][2])
+
+        if pending_reports:
+            progress = st.empty()
+            with st.spinner("Generating reports..."):
+                while pending_reports:
+                    for action, fut in list(pending_reports.items()):
+                        if not fut.done():
+                            continue
+                        pending_reports.pop(action)
+                        pdf_key, summary_key, _, label = report_jobs[action]
+                        try:
+                            pdf, ai_summary = fut.result()
+                        except Exception as e:
+                            st.error(f"Failed to generate {label}: {e}")
+                            continue
+                        st.session_state[pdf_key] = _save_artifact(pdf_key, pdf)
+                        if summary_key:
+                            st.session_state[summary_key] = ai_summary
+                    if pending_reports:
+                        # Touching an element lets a new click interrupt this rerun;
+                        # the jobs keep running and are collected on the next one.
+                        progress.caption("Working on: " + ", ".join(report_jobs[a][3] for a in pending_reports))
+                        time.sleep(0.1)
+            progress.empty()
 
         # Always show download buttons for generated reports
         st.markdown("---")
         st.subheader("Download Reports")
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if "pdf_standard" in st.session_state:
-                st.download_button(
-                    "Standard Report", 
-                    data=st.session_state["pdf_standard"], 
-                    file_name="LogSense_Report_Standard.pdf", 
-                    mime="application/pdf",
-                    use_container_width=True
-                )
-        
-        with col2:
-            if "pdf_local_ai" in st.session_state:
-                st.download_button(
-                    "Local AI Report", 
-                    data=st.session_state["pdf_local_ai"], 
-                    file_name="LogSense_Report_LocalAI.pdf", 
-                    mime="application/pdf",
-                    use_container_width=True
-                )
-        
-        with col3:
-            if "pdf_cloud_ai" in st.session_state:
-                st.download_button(
-                    "Cloud AI Report", 
-                    data=st.session_state["pdf_cloud_ai"], 
-                    file_name="LogSense_Report_CloudAI.pdf", 
-                    mime="application/pdf",
-                    use_container_width=True
-                )
+        downloads = (
+            ("Standard Report", "pdf_standard", "LogSense_Report_Standard.pdf"),
+            ("Local AI Report", "pdf_local_ai", "LogSense_Report_LocalAI.pdf"),
+            ("Cloud AI Report", "pdf_cloud_ai", "LogSense_Report_CloudAI.pdf"),
+        )
+        # Downloading a file changes nothing on the page, so skip the rerun
+        for col, (label, key, file_name) in zip(st.columns(3), downloads):
+            if key in st.session_state and os.path.exists(st.session_state[key]):
+                with col:
+                    st.download_button(
+                        label,
+                        data=_download_data(st.session_state[key]),
+                        file_name=file_name,
+                        mime="application/pdf",
+                        on_click="ignore",
+                        use_container_width=True
+                    )
 
         # Persistent Chat Panels (render based on session state)
         active_mode = st.session_state.get("active_report_mode")
@@ -760,35 +1098,64 @@ if redacted_events:
                     # Add relevant log snippets based on user question keywords
                     relevant_events = []
                     question_lower = prompt.lower()
-                    keywords = ["error", "warning", "fail", "critical", "timeout", "crash", "exception"]
                     
                     try:
-                        if any(kw in question_lower for kw in keywords):
+                        if any(kw in question_lower for kw in _CHAT_KEYWORDS):
                             # Include recent errors/warnings relevant to the question
-                            for ev in redacted_events[-50:]:  # Last 50 events for context
-                                ev_message = getattr(ev, 'message', '')
-                                ev_component = getattr(ev, 'component', '')
-                                if any(kw in ev_message.lower() or kw in ev_component.lower() 
-                                       for kw in question_lower.split() if len(kw) > 3):
-                                    relevant_events.append(ev)
+                            q_words = frozenset(w for w in question_lower.split() if len(w) > 3)
+                            window, haystacks, hits = _chat_window(events_df)
+                            if q_words and q_words not in hits:
+                                # One precompiled alternation screens every word in a single pass
+                                pattern = re.compile("|".join(map(re.escape, sorted(q_words))))
+                                hits[q_words] = np.flatnonzero(haystacks.str.contains(pattern).to_numpy())
+                            relevant_events = [window[i] for i in hits.get(q_words, ())]
                         
                         if not relevant_events:
                             # Fallback: include recent critical/error events
-                            relevant_events = [ev for ev in redacted_events 
-                                             if getattr(ev, 'severity', '').upper() in ('ERROR', 'CRITICAL')][-10:]
+                            relevant_events = [redacted_events[i] for i in stats["err_tail"]]
                     except Exception:
                         # Ultimate fallback: use last 10 events
                         relevant_events = redacted_events[-10:] if redacted_events else []
                     
+                    # Repeated questions reuse the earlier answer instead of calling the model again
+                    cache_key = _chat_cache_key(active_mode, prompt, ai_summary)
+                    reply = _chat_cache_get(cache_key)
+                    if reply is None:
+                        # The model call runs on the report pool so the page stays live
+                        # and can be cancelled; the reply is collected below
+                        def _chat_job(evts=relevant_events, ctx=chat_context, offline=(active_mode == "local_ai")):
+                            import ai_rca
+                            return ai_rca.analyze_with_ai(evts, redacted_metadata, [], ctx, offline=offline)
+                        st.session_state["pending_chat"] = (chat_key, cache_key, ai_summary, _get_report_pool().submit(_chat_job))
+                if reply is not None:
+                    st.session_state[chat_key].append(("assistant", reply))
+                    with st.chat_message("assistant"):
+                        st.markdown(reply)
+
+            pending_chat = st.session_state.get("pending_chat")
+            if pending_chat and pending_chat[0] == chat_key:
+                _, cache_key, ai_summary, fut = pending_chat
+                if st.button("Cancel", key="cancel_chat"):
+                    # A call that already started can't be stopped; its reply is dropped
+                    fut.cancel()
+                    st.session_state.pop("pending_chat", None)
+                    st.session_state[chat_key].append(("assistant", "Request cancelled."))
+                    with st.chat_message("assistant"):
+                        st.markdown("Request cancelled.")
+                else:
+                    waiting = st.empty()
+                    started = time.monotonic()
+                    with st.spinner("Thinking..." if active_mode == "local_ai" else "Consulting OpenAI..."):
+                        while not fut.done():
+                            # Touching an element lets the Cancel click interrupt this rerun
+                            waiting.caption(f"Waiting for reply... {time.monotonic() - started:.0f}s")
+                            time.sleep(0.1)
+                    waiting.empty()
+                    st.session_state.pop("pending_chat", None)
                     try:
-                        reply = ai_rca.analyze_with_ai(
-                            relevant_events,
-                            redacted_metadata,
-                            [],
-                            chat_context,
-                            offline=(active_mode == "local_ai")
-                        )
-                    except Exception as e:
+                        reply = fut.result()
+                        _chat_cache_put(cache_key, reply)
+                    except Exception:
                         # Safe fallback reply to avoid cascading UI failure
                         prior = (ai_summary or "N/A")
                         reply = (
@@ -799,9 +1166,9 @@ if redacted_events:
                             "- Validate installation phases (download, extraction, signature, apply, reboot).\n"
                             "- If this persists, please try narrowing the timeframe or keywords and ask again."
                         )
-                st.session_state[chat_key].append(("assistant", reply))
-                with st.chat_message("assistant"):
-                    st.markdown(reply)
+                    st.session_state[chat_key].append(("assistant", reply))
+                    with st.chat_message("assistant"):
+                        st.markdown(reply)
 
         # One-Pager PDF
         st.markdown("---")
@@ -809,31 +1176,17 @@ if redacted_events:
         if st.button("Generate Executive Summary", use_container_width=True):
             with st.spinner("Building executive summary..."):
                 try:
-                    canon_all = adapt_events_to_canonical(redacted_events)
-                    meta_block = {
-                        "build": build_number or app_version or "",
-                        "platform": test_environment,
-                        "versions": {"app": app_version},
-                        "ts_range": f"{str(canon_all[0].ts) if canon_all and canon_all[0].ts else ''} .. {str(canon_all[-1].ts) if canon_all and canon_all[-1].ts else ''}",
-                    }
-                    evidence = [{
-                        "ts": (str(ev.ts) if ev.ts else ""),
-                        "source": ev.source,
-                        "level": ev.level,
-                        "event_id": ev.event_id,
-                        "message": ev.message,
-                    } for ev in canon_all[:250]]
-                    payload = {
-                        "meta": meta_block,
-                        "deltas": {"new": [], "resolved": [], "persisting": []},
-                        "observations": {"spikes": [], "gaps": [], "first_seen": [], "clock_anomalies": []},
-                        "rca": {"root_causes": [], "next_actions": [], "confidence": 0.0},
-                        "evidence": evidence,
-                    }
-                    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                        out_path = build_onepager_pdf(payload, tmp.name, include_annexes=True)
-                        with open(out_path, "rb") as f:
-                            data = f.read()
+                    from report.pdf_builder import build_pdf as build_onepager_pdf
+                    payload = _onepager_payload(
+                        st.session_state.get("uploaded_file_hash"),
+                        build_number or app_version or "",
+                        test_environment,
+                        app_version,
+                        events_df,
+                    )
+                    buf = BytesIO()
+                    build_onepager_pdf(payload, buf, include_annexes=True)
+                    data = buf.getvalue()
                     st.download_button("Download Executive Summary", data=data, file_name="LogSense_Executive_Summary.pdf", mime="application/pdf")
                 except Exception as e:
                     st.error(f"Failed to build executive summary: {e}")
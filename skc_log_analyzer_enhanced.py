@@ -1,36 +1,29 @@
 # Streamlit UI and orchestration for LogSense (Enhanced Corporate UX)
 
 import os
+import threading
 os.environ["STREAMLIT_WATCHER_TYPE"] = "none"
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import zipfile, io
 from io import BytesIO
 from dotenv import load_dotenv
-import tempfile
 from datetime import datetime
-
-# Analysis modules
-from analysis.templates import TemplateExtractor
-from report.pdf_builder import build_pdf as build_onepager_pdf
-from analysis.event_chain import ChainSpec, detect_sequences
-from analysis.session import correlate_start_end
-from datamodels.events import Event as CanonEvent
-
-# Core modules
+import hashlib
+import re
+import importlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from types import MappingProxyType
+
+# Core modules (tab-specific and ML modules are imported where they are used,
+# so sklearn/matplotlib/reportlab stay off the cold-start path)
 import analysis
 import redaction
-import test_plan
-import charts
-import recommendations
-import ai_rca
-import report
 import setup
-import clustering_model
-import decision_tree_model
-import anomaly_svm
-from rca_rules import get_all_rca_summaries
 
 # UI Components
 from ui_components import (
@@ -41,14 +34,29 @@ from ui_components import (
 
 # --- Helpers: adapters to canonical Event model ---
 def _to_dt(obj):
+    if obj is None or isinstance(obj, datetime):
+        return obj
     try:
-        if isinstance(obj, datetime):
-            return obj
-        return datetime.fromisoformat(str(obj))
-    except Exception:
+        return datetime.fromisoformat(obj if isinstance(obj, str) else str(obj))
+    except ValueError:
         return None
 
+# Adapted events carry no meta/tags; nothing mutates them in place (template
+# mining copies), so every event shares these read-only empties instead of
+# allocating a dict and a list each
+_NO_META = MappingProxyType({})
+_NO_TAGS = ()
+
 def adapt_events_to_canonical(evts):
+    from datamodels.events import Event as CanonEvent
+    if evts and hasattr(evts[0], 'component'):
+        # Redaction output (timestamp/component/severity/message): one
+        # comprehension with direct attribute access instead of getattr chains
+        to_dt, canon_event = _to_dt, CanonEvent
+        return [canon_event(ts=to_dt(ev.timestamp), source=str(ev.component or 'text'),
+                            level=(str(ev.severity) if ev.severity else None),
+                            event_id=None, message=str(ev.message), meta=_NO_META, tags=_NO_TAGS)
+                for ev in evts]
     canon = []
     for ev in evts:
         ts = _to_dt(getattr(ev, 'timestamp', None))
@@ -56,9 +64,144 @@ def adapt_events_to_canonical(evts):
         level = getattr(ev, 'severity', None) or getattr(ev, 'level', None)
         msg = getattr(ev, 'message', '')
         canon.append(CanonEvent(ts=ts, source=str(source), level=(str(level) if level else None),
-                                event_id=None, message=str(msg), meta={}, tags=[]))
+                                event_id=None, message=str(msg), meta=_NO_META, tags=_NO_TAGS))
     return canon
 
+def _canonical_events(upload_key, evts):
+    """adapt_events_to_canonical(evts), computed once per upload.
+
+    Templates, Correlations and the Executive Summary all need the canonical
+    list; keying it on the upload keeps tab and widget reruns from
+    rebuilding it.
+    """
+    cached = st.session_state.get("canon_events")
+    if cached is None or cached[0] != upload_key:
+        cached = (upload_key, adapt_events_to_canonical(evts))
+        st.session_state["canon_events"] = cached
+    return cached[1]
+
+# Archive members parsed as logs (extension match is case-insensitive);
+# directory entries and macOS resource forks under __MACOSX/ are skipped
+LOG_MEMBER_RE = re.compile(r"\.(?:log|txt)$", re.IGNORECASE)
+
+def _log_members(zip_ref):
+    """Names of the archive's log members, in archive order."""
+    return [info.filename for info in zip_ref.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith("__MACOSX/")
+            and LOG_MEMBER_RE.search(info.filename)]
+
+# parse_logs is pure Python and holds the GIL, so archives with enough text
+# to repay worker startup are parsed one member per process.
+PARALLEL_PARSE_MIN_BYTES = 4 * 1024 * 1024
+
+def _parse_zip_members(zip_ref, names):
+    """Parse the named archive members into one event list, in archive order."""
+    total = sum(zip_ref.getinfo(name).file_size for name in names)
+    if len(names) < 2 or total < PARALLEL_PARSE_MIN_BYTES:
+        events = []
+        for name in names:
+            # Decode and parse line by line so a large member is never held whole
+            with zip_ref.open(name) as raw:
+                text = io.TextIOWrapper(raw, encoding='utf-8', errors='ignore')
+                events.extend(analysis.parse_logs_stream(text, fname=name))
+        return events
+    texts = [zip_ref.read(name).decode('utf-8', errors='ignore') for name in names]
+    workers = min(len(names), os.cpu_count() or 1)
+    # spawn, not fork: the Streamlit server process is multi-threaded
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as ex:
+        return list(chain.from_iterable(ex.map(analysis.parse_logs, texts, names)))
+
+# Tables and the executive summary show at most this much of each message
+TABLE_MSG_CHARS = 200
+
+# Severities are upper-cased once at redaction time; compare against this set
+ISSUE_SEVERITIES = frozenset(("ERROR", "CRITICAL", "WARNING"))
+
+def _events_frame(upload_key, evts):
+    """Columnar view of the redacted events, built once per upload.
+
+    Metrics and the timeline/issue tables are masks and slices of this frame
+    instead of Python passes over the event objects.
+    """
+    cached = st.session_state.get("events_frame")
+    if cached is None or cached[0] != upload_key:
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime([ev.timestamp for ev in evts], errors="coerce"),
+            "component": pd.Categorical([ev.component for ev in evts]),
+            "severity": pd.Categorical([ev.severity for ev in evts]),
+            "message": [ev.message for ev in evts],
+        })
+        # Long stack traces are cut once here so display frames stay small
+        df["message_short"] = [
+            m[:TABLE_MSG_CHARS] + "..." if len(m) > TABLE_MSG_CHARS else m for m in df["message"]
+        ]
+        cached = (upload_key, df)
+        st.session_state["events_frame"] = cached
+    return cached[1]
+
+def _events_table(df, max_msg=None):
+    """Turn a slice of the events frame into the Timestamp/Component/Severity/Message table."""
+    msgs = df["message_short"].to_numpy()
+    if max_msg:
+        msgs = [m[:max_msg] + "..." if len(m) > max_msg else m for m in msgs]
+    return pd.DataFrame({
+        "Timestamp": df["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S").fillna("").to_numpy(),
+        "Component": df["component"].to_numpy(),
+        "Severity": df["severity"].to_numpy(),
+        "Message": msgs,
+    })
+
+# (engine flag, report button) pairs; the Reports tab shows those whose engine is on
+REPORT_ACTIONS = (
+    ("python", {"key": "no_ai", "label": "[U+1F4C4] Standard Report", "type": "secondary"}),
+    ("local_llm", {"key": "local_ai", "label": "[U+1F916] Local AI Report", "type": "primary"}),
+    ("cloud_ai", {"key": "cloud_ai", "label": "[U+2601][U+FE0F] Cloud AI Report", "type": "primary"}),
+)
+
+# (key, button label, spinner text, module, function) for the ML tab; every
+# model takes the event list and returns a matplotlib figure or None
+ML_ACTIONS = (
+    ("cluster", "Run Clustering", "Clustering events...", "clustering_model", "cluster_events"),
+    ("severity", "Severity Prediction", "Analyzing severity predictions...", "decision_tree_model", "analyze_event_severity"),
+    ("anomaly", "Anomaly Detection", "Detecting anomalies...", "anomaly_svm", "detect_anomalies"),
+)
+
+@st.cache_resource(show_spinner=False)
+def _get_ml_pool():
+    """Worker threads for the ML models, shared by all sessions."""
+    return ThreadPoolExecutor(max_workers=len(ML_ACTIONS), thread_name_prefix="logsense-ml")
+
+def _ml_futures(upload_key, events):
+    """Figures for every ML model of this upload, keyed by ML_ACTIONS key.
+
+    The first ML click submits all models at once (sklearn releases the GIL
+    while fitting; the models draw on their own Figure, not pyplot), so later
+    clicks on the other buttons reuse the result. A model whose future was
+    dropped after failing is submitted again.
+    """
+    cached = st.session_state.get("ml_futures")
+    if cached is None or cached[0] != upload_key:
+        cached = (upload_key, {})
+        st.session_state["ml_futures"] = cached
+    futures = cached[1]
+    pool = None
+    for key, _label, _spinner, module, func in ML_ACTIONS:
+        if key not in futures:
+            pool = pool or _get_ml_pool()
+            futures[key] = pool.submit(getattr(importlib.import_module(module), func), events)
+    return futures
+
+@st.cache_resource(show_spinner=False)
+def _get_template_extractor():
+    """Process-wide TemplateExtractor plus the lock guarding it.
+
+    The extractor accumulates counts, so callers hold the lock and reset()
+    it before each assign()/summary() run.
+    """
+    from analysis.templates import TemplateExtractor
+    return TemplateExtractor(), threading.Lock()
+
 # Load environment variables
 load_dotenv()
 
@@ -141,37 +284,38 @@ with st.expander("[U+1F4C1] Log File Upload", expanded=True):
     
     if uploaded_file is not None:
         st.session_state["current_step"] = 1
+        # One snapshot of the upload feeds the digest and the parse, so nothing
+        # re-reads (or seeks) the Streamlit buffer. Widget reruns and re-uploads
+        # of the same file reuse the parse and redaction via the digest.
+        raw_bytes = uploaded_file.getvalue()
+        upload_key = hashlib.blake2b(raw_bytes).hexdigest()
+        parsed = st.session_state.get("parsed_upload")
         
-        with st.spinner("Processing uploaded files..."):
-            if uploaded_file.name.endswith('.zip'):
-                with zipfile.ZipFile(uploaded_file, 'r') as zip_ref:
-                    zip_contents = zip_ref.namelist()
-                    log_files = [f for f in zip_contents if f.endswith(('.txt', '.log'))]
-                    
-                    render_info_card(
-                        "Archive Contents", 
-                        f"Found {len(log_files)} log files in ZIP archive ({len(zip_contents)} total files)",
-                        "[U+1F4C1]"
-                    )
-                    
-                    for file_name in log_files:
-                        with zip_ref.open(file_name) as file:
-                            content = file.read().decode('utf-8', errors='ignore')
-                            file_events = analysis.parse_logs(content)
-                            events.extend(file_events)
-            else:
-                content = uploaded_file.read().decode('utf-8', errors='ignore')
-                events = analysis.parse_logs(content)
-        
-        st.session_state["files_processed"] = 1 if not uploaded_file.name.endswith('.zip') else len(log_files)
-        st.session_state["events_analyzed"] = len(events)
+        if parsed is None or parsed[0] != upload_key:
+            archive_note = None
+            with st.spinner("Processing uploaded files..."):
+                if uploaded_file.name.endswith('.zip'):
+                    with zipfile.ZipFile(BytesIO(raw_bytes), 'r') as zip_ref:
+                        log_files = _log_members(zip_ref)
+                        archive_note = f"Found {len(log_files)} log files in ZIP archive ({len(zip_ref.namelist())} total files)"
+                        events = _parse_zip_members(zip_ref, log_files)
+                else:
+                    content = raw_bytes.decode('utf-8', errors='ignore')
+                    events = analysis.parse_logs(content)
+            
+            st.session_state["files_processed"] = 1 if not uploaded_file.name.endswith('.zip') else len(log_files)
+            st.session_state["events_analyzed"] = len(events)
+            
+            # Apply redaction (once per upload digest; reruns read it back from parsed_upload)
+            with st.spinner("Applying redaction patterns..."):
+                redacted_events, redacted_metadata = redaction.apply_redaction(events, {})
+            parsed = (upload_key, archive_note, events, redacted_events, redacted_metadata)
+            st.session_state["parsed_upload"] = parsed
         
+        _, archive_note, events, redacted_events, redacted_metadata = parsed
+        if archive_note:
+            render_info_card("Archive Contents", archive_note, "[U+1F4C1]")
         render_status_badge("success", f"Processed {len(events)} log events")
-        
-        # Apply redaction
-        with st.spinner("Applying redaction patterns..."):
-            redacted_events, redacted_metadata = redaction.apply_redaction(events, {})
-        
         render_status_badge("success", f"Redaction complete. {len(redacted_events)} events processed.")
         st.session_state["current_step"] = 2
 
@@ -180,14 +324,19 @@ if redacted_events:
     st.session_state["current_step"] = 3
     
     # Key metrics
-    issues = [ev for ev in redacted_events if ev.severity in ["ERROR", "CRITICAL", "WARNING"]]
-    st.session_state["issues_found"] = len(issues)
+    events_df = _events_frame(upload_key, redacted_events)
+    # Mask on the categorical codes: the category lookup touches a handful of
+    # labels, the per-event sweep is a single integer isin
+    sev_codes = events_df["severity"].cat.codes.to_numpy()
+    sev_cats = events_df["severity"].cat.categories
+    issues_df = events_df[np.isin(sev_codes, np.flatnonzero(sev_cats.isin(ISSUE_SEVERITIES)))]
+    st.session_state["issues_found"] = len(issues_df)
     
     render_metric_cards({
         "Total Events": len(redacted_events),
-        "Issues Found": len(issues),
+        "Issues Found": len(issues_df),
         "Files Processed": st.session_state["files_processed"],
-        "Critical Errors": len([ev for ev in issues if ev.severity == "CRITICAL"])
+        "Critical Errors": int(np.isin(sev_codes, np.flatnonzero(sev_cats == "CRITICAL")).sum())
     })
 
     # Build user context for AI
@@ -229,6 +378,7 @@ if redacted_events:
                     plan_data = setup.get_test_plan(selected_plan_file)
                     if plan_data:
                         friendly_name = plan_labels.get(selected_plan_file, selected_plan_file)
+                        import test_plan
                         rich_result = test_plan.validate_plan(plan_data, events, plan_name=friendly_name)
                         st.session_state["validation_result"] = rich_result
                         if rich_result and rich_result.get("steps"):
@@ -256,25 +406,14 @@ if redacted_events:
     st.subheader("[U+1F4CA] Timeline & Issues Analysis")
     
     # Timeline
-    timeline_events = sorted(redacted_events, key=lambda x: x.timestamp)[:50]  # Show first 50
-    timeline_df = pd.DataFrame([{
-        "Timestamp": str(ev.timestamp),
-        "Component": ev.component,
-        "Severity": ev.severity,
-        "Message": ev.message[:100] + "..." if len(ev.message) > 100 else ev.message
-    } for ev in timeline_events])
+    # Partial sort: only the earliest 50 rows are ordered (ties keep upload order)
+    timeline_df = _events_table(events_df.nsmallest(50, "timestamp"), max_msg=100)
     
     render_data_table(timeline_df, "Event Timeline")
 
     # Issues Summary
-    if issues:
-        issues_df = pd.DataFrame([{
-            "Timestamp": str(ev.timestamp),
-            "Component": ev.component,
-            "Severity": ev.severity,
-            "Message": ev.message
-        } for ev in issues])
-        render_data_table(issues_df, "Errors and Warnings")
+    if len(issues_df):
+        render_data_table(_events_table(issues_df), "Errors and Warnings")
     else:
         render_info_card("No Issues Found", "No warnings or errors detected in the logs.", "[OK]", "#d4edda")
 
@@ -285,10 +424,17 @@ if redacted_events:
         if st.checkbox("Show Templates (Structural Patterns)", value=False):
             st.subheader("Templates (Structural Patterns)")
             with st.spinner("Mining templates..."):
-                canon_all = adapt_events_to_canonical(redacted_events)
-                tmpl = TemplateExtractor()
-                assigned = tmpl.assign(canon_all)
-                summary_rows = tmpl.summary()
+                # Mined once per upload; toggling the checkbox reuses the rows
+                cached = st.session_state.get("template_rows")
+                if cached is None or cached[0] != upload_key:
+                    canon_all = _canonical_events(upload_key, redacted_events)
+                    tmpl, tmpl_lock = _get_template_extractor()
+                    with tmpl_lock:
+                        tmpl.reset()
+                        tmpl.count(canon_all)
+                        cached = (upload_key, tmpl.summary())
+                    st.session_state["template_rows"] = cached
+                summary_rows = cached[1]
             if summary_rows:
                 tmpl_df = pd.DataFrame([{"Template ID": tid, "Count": cnt, "Template": tpl} for tid, cnt, tpl in summary_rows])
                 render_data_table(tmpl_df, "Template Analysis")
@@ -301,33 +447,28 @@ if redacted_events:
             "[U+1F52C]"
         )
 
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            if st.button("Run Clustering", use_container_width=True):
-                with st.spinner("Clustering events..."):
-                    cluster_fig = clustering_model.cluster_events(events)
-                    if cluster_fig:
-                        st.pyplot(cluster_fig)
-
-        with col2:
-            if st.button("Severity Prediction", use_container_width=True):
-                with st.spinner("Analyzing severity predictions..."):
-                    severity_fig = decision_tree_model.analyze_event_severity(events)
-                    if severity_fig:
-                        st.pyplot(severity_fig)
-
-        with col3:
-            if st.button("Anomaly Detection", use_container_width=True):
-                with st.spinner("Detecting anomalies..."):
-                    anomaly_fig = anomaly_svm.detect_anomalies(events)
-                    if anomaly_fig:
-                        st.pyplot(anomaly_fig)
+        for col, (key, label, spinner, _module, _func) in zip(st.columns(len(ML_ACTIONS)), ML_ACTIONS):
+            with col:
+                if st.button(label, use_container_width=True):
+                    with st.spinner(spinner):
+                        futures = _ml_futures(upload_key, events)
+                        try:
+                            fig = futures[key].result()
+                        except Exception as e:
+                            # Forget the failed run so the next click retries it
+                            futures.pop(key, None)
+                            st.error(f"{label} failed: {e}")
+                            fig = None
+                        if fig:
+                            st.pyplot(fig)
 
     with tab_corr:
         if st.checkbox("Show Correlations (Sequences & Sessions)", value=False):
             st.subheader("Correlations")
             with st.spinner("Detecting common sequences and sessions..."):
-                canon_all = adapt_events_to_canonical(redacted_events)
+                canon_all = _canonical_events(upload_key, redacted_events)
+                from analysis.event_chain import ChainSpec, detect_sequences
+                from analysis.session import correlate_start_end
                 spec = ChainSpec(steps=[{"level": "WARN"}, {"level": "ERROR"}], window_sec=300)
                 chain_hits = detect_sequences(canon_all, spec, label="WARN->ERROR")
                 sessions = correlate_start_end(canon_all, start_contains="Action start", end_contains="Action ended", correlate_key="msi_action")
@@ -336,28 +477,32 @@ if redacted_events:
             with col1:
                 st.markdown("**Sequence Hits**")
                 if chain_hits:
-                    seq_rows = [{
-                        "Label": h.label,
-                        "Start": str(h.start),
-                        "End": str(h.end),
-                        "Span (s)": (h.end - h.start).total_seconds(),
-                        "Len": len(h.indices),
-                    } for h in chain_hits[:50]]
-                    render_data_table(pd.DataFrame(seq_rows), "Sequences")
+                    hits = chain_hits[:50]
+                    starts = pd.to_datetime([h.start for h in hits])
+                    ends = pd.to_datetime([h.end for h in hits])
+                    seq_df = pd.DataFrame({
+                        "Label": [h.label for h in hits],
+                        "Start": starts.strftime("%Y-%m-%d %H:%M:%S"),
+                        "End": ends.strftime("%Y-%m-%d %H:%M:%S"),
+                        "Span (s)": (ends - starts).total_seconds(),
+                        "Len": [len(h.indices) for h in hits],
+                    })
+                    render_data_table(seq_df, "Sequences")
                 else:
                     st.info("No sequence patterns matched.")
             
             with col2:
                 st.markdown("**Sessions**")
                 if sessions:
-                    ses_rows = [{
-                        "Key": s.key,
-                        "Start": str(s.start),
-                        "End": (str(s.end) if s.end else ""),
-                        "Duration (s)": (s.duration_sec if s.duration_sec is not None else ""),
-                        "Source": s.source,
-                    } for s in sessions[:50]]
-                    render_data_table(pd.DataFrame(ses_rows), "Sessions")
+                    shown = sessions[:50]
+                    ses_df = pd.DataFrame({
+                        "Key": [s.key for s in shown],
+                        "Start": pd.to_datetime([s.start for s in shown]).strftime("%Y-%m-%d %H:%M:%S"),
+                        "End": pd.to_datetime([s.end for s in shown]).strftime("%Y-%m-%d %H:%M:%S").fillna(""),
+                        "Duration (s)": [(s.duration_sec if s.duration_sec is not None else "") for s in shown],
+                        "Source": [s.source for s in shown],
+                    })
+                    render_data_table(ses_df, "Sessions")
                 else:
                     st.info("No start/end session pairs detected.")
 
@@ -372,44 +517,26 @@ if redacted_events:
             "#e3f2fd"
         )
 
-        # Report generation buttons
-        report_actions = []
-        
-        if use_python_eng:
-            report_actions.append({
-                "key": "no_ai",
-                "label": "[U+1F4C4] Standard Report",
-                "type": "secondary"
-            })
-        
-        if use_local_llm:
-            report_actions.append({
-                "key": "local_ai",
-                "label": "[U+1F916] Local AI Report",
-                "type": "primary"
-            })
-        
-        if use_cloud_ai:
-            report_actions.append({
-                "key": "cloud_ai",
-                "label": "[U+2601][U+FE0F] Cloud AI Report",
-                "type": "primary"
-            })
+        # Report generation buttons, one per enabled engine
+        report_actions = [action for engine, action in REPORT_ACTIONS if engines[engine]]
 
         selected_action = render_action_buttons(report_actions, "report")
         
         if selected_action == "no_ai":
+            import report
             with st.spinner("Generating standard report..."):
                 pdf = report.generate_pdf(redacted_events, redacted_metadata, st.session_state.get("validation_result", {}), {}, user_name=user_name, app_name=app_name, ai_summary=None, user_context=user_context)
                 st.download_button("Download Standard Report", data=pdf, file_name="LogSense_Report_Standard.pdf", mime="application/pdf")
         
         elif selected_action == "local_ai":
+            import ai_rca, report
             with st.spinner("Generating AI summary using Local LLM..."):
                 ai_summary = ai_rca.analyze_with_ai(redacted_events, redacted_metadata, [], user_context, offline=True)
                 pdf = report.generate_pdf(redacted_events, redacted_metadata, st.session_state.get("validation_result", {}), {}, user_name=user_name, app_name=app_name, ai_summary=ai_summary, user_context=user_context)
                 st.download_button("Download Local AI Report", data=pdf, file_name="LogSense_Report_LocalAI.pdf", mime="application/pdf")
         
         elif selected_action == "cloud_ai":
+            import ai_rca, report
             with st.spinner("Generating AI summary using OpenAI..."):
                 ai_summary = ai_rca.analyze_with_ai(redacted_events, redacted_metadata, [], user_context, offline=False)
                 pdf = report.generate_pdf(redacted_events, redacted_metadata, st.session_state.get("validation_result", {}), {}, user_name=user_name, app_name=app_name, ai_summary=ai_summary, user_context=user_context)
@@ -421,20 +548,29 @@ if redacted_events:
         if st.button("Generate Executive Summary", use_container_width=True):
             with st.spinner("Building executive summary..."):
                 try:
-                    canon_all = adapt_events_to_canonical(redacted_events)
+                    from report.pdf_builder import build_pdf as build_onepager_pdf
+                    # events_df rows line up with the canonical events, so the
+                    # header range and evidence are read from its columns
+                    ts_all = events_df["timestamp"]
+                    first_ts = str(ts_all.iloc[0]) if len(ts_all) and pd.notna(ts_all.iloc[0]) else ""
+                    last_ts = str(ts_all.iloc[-1]) if len(ts_all) and pd.notna(ts_all.iloc[-1]) else ""
                     meta_block = {
                         "build": build_number or app_version or "",
                         "platform": test_environment,
                         "versions": {"app": app_version},
-                        "ts_range": f"{str(canon_all[0].ts) if canon_all and canon_all[0].ts else ''} .. {str(canon_all[-1].ts) if canon_all and canon_all[-1].ts else ''}",
+                        "ts_range": f"{first_ts} .. {last_ts}",
                     }
-                    evidence = [{
-                        "ts": (str(ev.ts) if ev.ts else ""),
-                        "source": ev.source,
-                        "level": ev.level,
-                        "event_id": ev.event_id,
-                        "message": ev.message,
-                    } for ev in canon_all[:250]]
+                    head = events_df.head(250)
+                    ts_text = head["timestamp"].astype(str).where(head["timestamp"].notna(), "")
+                    # Events without a component are attributed to "text", as the per-event path did
+                    component = head["component"]
+                    source_text = component.astype(str).where(component.notna() & (component != ""), "text")
+                    evidence = [
+                        {"ts": ts, "source": source, "level": level, "event_id": None, "message": msg}
+                        for ts, source, level, msg in zip(
+                            ts_text, source_text, head["severity"].astype(str), head["message_short"]
+                        )
+                    ]
                     payload = {
                         "meta": meta_block,
                         "deltas": {"new": [], "resolved": [], "persisting": []},
@@ -442,10 +578,9 @@ if redacted_events:
                         "rca": {"root_causes": [], "next_actions": [], "confidence": 0.0},
                         "evidence": evidence,
                     }
-                    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                        out_path = build_onepager_pdf(payload, tmp.name, include_annexes=True)
-                        with open(out_path, "rb") as f:
-                            data = f.read()
+                    buf = BytesIO()
+                    build_onepager_pdf(payload, buf, include_annexes=True)
+                    data = buf.getvalue()
                     st.download_button("Download Executive Summary", data=data, file_name="LogSense_Executive_Summary.pdf", mime="application/pdf")
                 except Exception as e:
                     st.error(f"Failed to build executive summary: {e}")
@@ -6,40 +6,39 @@ import streamlit as st
 
 # Only import what's absolutely needed at startup
 from datetime import datetime
-import tempfile
-import hashlib
+import importlib
 
-# ALL other imports moved to functions - lazy loading
-def get_analysis_modules():
-    """Lazy load analysis modules only when needed"""
-    global analysis, redaction, test_plan, charts, recommendations, ai_rca, report
-    if 'analysis' not in globals():
-        import analysis
-        import redaction  
-        import test_plan
-        import charts
-        import recommendations
-        import ai_rca
-        import report
-    return analysis, redaction, test_plan, charts, recommendations, ai_rca, report
+# ALL other imports are deferred: global name -> module, or (module, attribute)
+_LAZY = {
+    # analysis engine
+    "analysis": "analysis",
+    "redaction": "redaction",
+    "test_plan": "test_plan",
+    "charts": "charts",
+    "recommendations": "recommendations",
+    "ai_rca": "ai_rca",
+    "report": "report",
+    # heavy dependencies
+    "pd": "pandas",
+    "zipfile": "zipfile",
+    "io": "io",
+    "BytesIO": ("io", "BytesIO"),
+    "load_dotenv": ("dotenv", "load_dotenv"),
+    # UI
+    "ui_components": "ui_components",
+}
 
-def get_heavy_imports():
-    """Lazy load heavy dependencies only when needed"""
-    global pd, zipfile, io, BytesIO, load_dotenv
-    if 'pd' not in globals():
-        import pandas as pd
-        import zipfile
-        import io
-        from io import BytesIO
-        from dotenv import load_dotenv
-    return pd, zipfile, io, BytesIO, load_dotenv
-
-def get_ui_components():
-    """Lazy load UI components"""
-    global ui_components
-    if 'ui_components' not in globals():
-        import ui_components
-    return ui_components
+def lazy_import(*names):
+    """Import the named _LAZY entries on first use and bind them as module globals"""
+    g = globals()
+    for name in names:
+        if name not in g:
+            spec = _LAZY[name]
+            if isinstance(spec, str):
+                g[name] = importlib.import_module(spec)
+            else:
+                g[name] = getattr(importlib.import_module(spec[0]), spec[1])
+    return tuple(g[name] for name in names)
 
 # Streamlit app starts immediately - no heavy imports
 st.set_page_config(
@@ -64,18 +63,18 @@ uploaded_file = st.file_uploader("Upload log file", type=['txt', 'log', 'zip'])
 if uploaded_file:
     with st.spinner("Loading analysis modules..."):
         # NOW load heavy imports
-        pd, zipfile, io, BytesIO, load_dotenv = get_heavy_imports()
+        lazy_import("pd", "zipfile", "io", "BytesIO", "load_dotenv")
         
     st.success("[OK] Heavy modules loaded - ready for analysis")
     
     # Basic file info without heavy processing
     st.write(f"File: {uploaded_file.name}")
-    st.write(f"Size: {len(uploaded_file.getvalue())} bytes")
+    st.write(f"Size: {uploaded_file.size} bytes")
     
     if st.button("Start Analysis"):
         with st.spinner("Loading analysis engine..."):
             # Load analysis modules only when actually needed
-            analysis, redaction, test_plan, charts, recommendations, ai_rca, report = get_analysis_modules()
+            lazy_import("analysis", "redaction", "test_plan", "charts", "recommendations", "ai_rca", "report")
             
         st.success("[OK] Analysis complete!")
         st.write("Analysis modules loaded successfully")
@@ -4,8 +4,8 @@ os.environ["STREAMLIT_WATCHER_TYPE"] = "none"
 
 import streamlit as st
 from datetime import datetime
-import tempfile
-import hashlib
+
+PREVIEW_BYTES = 64 * 1024  # upload prefix decoded for the line preview
 
 # Streamlit app starts immediately - no heavy imports
 st.set_page_config(
@@ -32,12 +32,15 @@ if uploaded_file:
     
     # Basic file info without heavy processing
     st.write(f"**File**: {uploaded_file.name}")
-    st.write(f"**Size**: {len(uploaded_file.getvalue())} bytes")
+    st.write(f"**Size**: {uploaded_file.size} bytes")
     
     # Show first few lines of file
     if uploaded_file.type == "text/plain":
-        content = uploaded_file.getvalue().decode('utf-8')
-        lines = content.split('\n')[:10]
+        # Decode only a bounded head for the preview; the full file is never decoded
+        uploaded_file.seek(0)
+        head = uploaded_file.read(PREVIEW_BYTES).decode('utf-8', errors='ignore')
+        uploaded_file.seek(0)
+        lines = head.split('\n', 10)[:10]  # maxsplit: stop splitting after the preview
         st.text_area("First 10 lines:", '\n'.join(lines), height=200)
     
     if st.button("Analyze Log"):
@@ -48,7 +51,7 @@ if uploaded_file:
             
         st.success("[OK] Analysis complete!")
         st.write("**Sample Analysis Results:**")
-        st.write("- Total lines: ", len(content.split('\n')) if uploaded_file.type == "text/plain" else "Unknown")
+        st.write("- Total lines: ", uploaded_file.getvalue().count(b'\n') + 1 if uploaded_file.type == "text/plain" else "Unknown")
         st.write("- File type: ", uploaded_file.type)
         st.write("- Status: Ready for processing")
 
@@ -3,45 +3,151 @@ test_plan.py - Validates parsed logs against structured test plans (JSON/YAML)
 """
 
 import json
-import yaml
+import re
+from bisect import bisect_right
+from functools import lru_cache
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import orjson
+    _jloads = orjson.loads
+except ImportError:  # stdlib fallback
+    _jloads = json.loads
+
+def _yaml_load(f):
+    """Parse YAML; yaml is imported on the first YAML plan, not with this module."""
+    import yaml
+    # libyaml-backed loader when PyYAML was built with it
+    return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+@lru_cache(maxsize=32)
+def _load_cached(path, mtime):
+    """Parse a plan file; mtime only keys the cache so edited files are re-read."""
+    if path.endswith(".yaml") or path.endswith(".yml"):
+        with open(path, "r", encoding="utf-8") as f:
+            return _yaml_load(f)
+    with open(path, "rb") as f:
+        return _jloads(f.read())
 
 def load_test_plan(path):
     """
     Loads a test plan from a .json or .yaml file.
+    Parsed plans are cached per (path, mtime); callers share the returned object.
     """
-    if not os.path.exists(path):
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
         return None
 
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            if path.endswith(".yaml") or path.endswith(".yml"):
-                return yaml.safe_load(f)
-            else:
-                return json.load(f)
+        return _load_cached(path, mtime)
     except Exception as e:
         print(f"[Test Plan] Failed to load: {e}")
         return None
 
+# Evidence lines kept per step in the validation payload
+EVIDENCE_PER_STEP = 3
+# Separates event lines in the joined corpus validate_plan scans
+_LINE_SEP = "\x00"
+
+# Phase keywords, in precedence order: the first phase with any keyword in
+# the step text wins
+_PHASES = (
+    ("Download", ("download", "fetch")),
+    ("Extraction", ("extract", "unpack", "decompress")),
+    ("Verification", ("verify", "signature", "hash")),
+    ("Install/Apply", ("install", "apply", "execute", "msi", "setup")),
+    ("Reboot", ("reboot", "restart")),
+    ("Post-Install/Start", ("launch", "start service", "service start")),
+)
+# One zero-width pattern reports, at every position, which phase's keyword
+# starts there (group pN = _PHASES[N]), so a single scan sees all of them
+_PHASE_RE = re.compile("(?=(?:%s))" % "|".join(
+    "(?P<p%d>%s)" % (i, "|".join(map(re.escape, words)))
+    for i, (_phase, words) in enumerate(_PHASES)
+))
+
 def _infer_phase(text: str) -> str | None:
     """Lightweight heuristic to infer phase from step text."""
     if not text:
         return None
-    t = text.lower()
-    if any(w in t for w in ["download", "fetch"]):
-        return "Download"
-    if any(w in t for w in ["extract", "unpack", "decompress"]):
-        return "Extraction"
-    if any(w in t for w in ["verify", "signature", "hash"]):
-        return "Verification"
-    if any(w in t for w in ["install", "apply", "execute", "msi", "setup"]):
-        return "Install/Apply"
-    if any(w in t for w in ["reboot", "restart"]):
-        return "Reboot"
-    if any(w in t for w in ["launch", "start service", "service start"]):
-        return "Post-Install/Start"
-    return None
+    found = {m.lastgroup for m in _PHASE_RE.finditer(text.lower())}
+    if not found:
+        return None
+    return _PHASES[min(int(g[1:]) for g in found)][0]
+
+@lru_cache(maxsize=256)
+def _any_of(words: Tuple[str, ...]):
+    """
+    Compiled alternation matching any of the literal words, or None if there are none.
+    Cached, so re-validating the same plan (per log, per rerun) reuses its patterns.
+    """
+    if not words:
+        return None
+    return re.compile("|".join(map(re.escape, words)))
+
+def _join_lines(lows: List[str]):
+    """
+    All lines in one string plus each line's start offset, so a regex can
+    sweep the whole corpus in C and hits map back to lines by bisect.
+    A match can only span two lines if a word contains _LINE_SEP; see _line_hits.
+    """
+    line_starts = [0]
+    for low in lows[:-1]:
+        line_starts.append(line_starts[-1] + len(low) + 1)
+    return _LINE_SEP.join(lows), line_starts
+
+def _line_hits(pattern, words: Tuple[str, ...], blob: str, line_starts: List[int], lows: List[str]) -> Iterator[int]:
+    """Indices of the lines pattern (built from words) matches, in order, lazily."""
+    if any(_LINE_SEP in w for w in words):
+        # Such a word could match across the separator; test lines one by one
+        search = pattern.search
+        yield from (i for i, low in enumerate(lows) if search(low))
+        return
+    n_lines = len(line_starts)
+    m = pattern.search(blob)
+    while m:
+        i = bisect_right(line_starts, m.start()) - 1
+        yield i
+        # Resume at the next line so each line counts once
+        m = pattern.search(blob, line_starts[i + 1]) if i + 1 < n_lines else None
+
+def _scan_step(hit_re, hit_words: Tuple[str, ...], neg_re, blob: str, line_starts: List[int],
+               lows: List[str], msgs: List[str]):
+    """
+    Find one step's hits in the joined corpus.
+
+    Returns (hit_idx, last_idx, any_negative): indices of the first hits
+    (evidence), index of the last hit (None without hits), and whether a hit's
+    message carries a negative pattern. Only indices are recorded; callers
+    build evidence from the per-field lists.
+
+    Steps are scanned one after another: re holds the GIL while searching, so
+    a thread pool would not overlap them, and a process pool would have to
+    ship the whole corpus to each worker.
+    """
+    hit_idx: List[int] = []
+    last_idx = None
+    any_negative = False
+    n_lines = len(lows)
+    if hit_re is None:
+        return hit_idx, last_idx, any_negative
+
+    for i in _line_hits(hit_re, hit_words, blob, line_starts, lows):
+        if len(hit_idx) < EVIDENCE_PER_STEP:
+            hit_idx.append(i)
+        last_idx = i
+        # A hit whose message carries a negative pattern fails the step
+        if neg_re and not any_negative and neg_re.search(msgs[i].lower()):
+            any_negative = True
+        if len(hit_idx) >= EVIDENCE_PER_STEP and (any_negative or neg_re is None):
+            # Status and evidence are settled; only the last hit is left,
+            # and scanning back from the end finds it soonest
+            last_idx = next((j for j in range(n_lines - 1, i, -1) if hit_re.search(lows[j])), i)
+            break
+
+    return hit_idx, last_idx, any_negative
 
 def validate_plan(plan: Dict[str, Any] | List[Dict[str, Any]], events: List[Any], plan_name: str | None = None) -> Dict[str, Any]:
     """
@@ -69,7 +175,9 @@ def validate_plan(plan: Dict[str, Any] | List[Dict[str, Any]], events: List[Any]
     first_failure_step = None
     first_failure_phase = None
 
-    for idx, step in enumerate(steps):
+    # Resolve every step's text and match words up front
+    step_specs = []
+    for step in steps:
         # Support multiple field name formats
         step_text = (
             step.get("Step Action") or 
@@ -88,52 +196,59 @@ def validate_plan(plan: Dict[str, Any] | List[Dict[str, Any]], events: List[Any]
         neg_keywords = step.get("negative_patterns", []) or []
         phase = step.get("phase") or _infer_phase(step_text)
 
-        found = False
-        ev_hits: List[Dict[str, Any]] = []
-
-        # Build simple corpus pass for efficiency
-        for ev in events:
-            try:
-                msg = str(getattr(ev, 'message', ''))
-                line = " ".join([
-                    str(getattr(ev, 'timestamp', '')),
-                    str(getattr(ev, 'component', '')),
-                    str(getattr(ev, 'severity', '')),
-                    msg,
-                ])
-                low = line.lower()
-            except Exception:
-                continue
-
-            # Negative pattern takes precedence for failure evidence (still records evidence)
-            neg_hit = any((kw or "").lower() in low for kw in neg_keywords if kw)
-
-            # Positive matches: main step text or any keyword
-            pos_hit = False
-            if step_text and step_text.lower() in low:
-                pos_hit = True
-            elif keywords and any((kw or "").lower() in low for kw in keywords if kw):
-                pos_hit = True
-
-            if pos_hit or neg_hit:
-                ev_hits.append({
-                    "timestamp": str(getattr(ev, 'timestamp', '')),
-                    "component": str(getattr(ev, 'component', '')),
-                    "message": msg,
-                })
-
-        # Decide status: if any negative hit present in hits, mark Fail; else Pass if any positive; else Fail
-        if ev_hits:
-            # Determine if any hit came from a negative pattern
-            any_negative = False
-            for h in ev_hits:
-                low_msg = (h.get("message") or "").lower()
-                if any((kw or "").lower() in low_msg for kw in neg_keywords if kw):
-                    any_negative = True
-                    break
-            status = "Fail" if any_negative else "Pass"
-        else:
-            status = "Fail"
+        # Positive: main step text or any keyword; negative patterns still
+        # record evidence and take precedence for failure
+        step_low = step_text.lower()
+        pos_words = ((step_low,) if step_low else ()) + tuple(kw.lower() for kw in keywords if kw)
+        neg_words = tuple(kw.lower() for kw in neg_keywords if kw)
+        step_specs.append((step_text, expected, phase, pos_words, neg_words))
+
+    # Stringify and lowercase every event once, into parallel per-field lists;
+    # each step then only indexes them for the lines it hits
+    lows: List[str] = []
+    msgs: List[str] = []
+    tss: List[str] = []
+    comps: List[str] = []
+    for ev in events:
+        try:
+            msg = str(getattr(ev, 'message', ''))
+            ts = str(getattr(ev, 'timestamp', ''))
+            comp = str(getattr(ev, 'component', ''))
+            low = " ".join([ts, comp, str(getattr(ev, 'severity', '')), msg]).lower()
+        except Exception:
+            continue
+        lows.append(low)
+        msgs.append(msg)
+        tss.append(ts)
+        comps.append(comp)
+
+    # Steps share most of their words, so one sweep with every distinct plan
+    # word keeps just the lines some step can hit; the per-step scans below
+    # then run over that (usually much smaller) corpus, in original order
+    plan_words = tuple(dict.fromkeys(w for spec in step_specs for w in spec[3] + spec[4]))
+    plan_re = _any_of(plan_words)
+    keep = list(_line_hits(plan_re, plan_words, *_join_lines(lows), lows)) if plan_re else []
+    if len(keep) < len(lows):
+        lows = [lows[i] for i in keep]
+        msgs = [msgs[i] for i in keep]
+        tss = [tss[i] for i in keep]
+        comps = [comps[i] for i in keep]
+    blob, line_starts = _join_lines(lows)
+
+    for idx, (step_text, expected, phase, pos_words, neg_words) in enumerate(step_specs):
+        # One alternation per step instead of a Python `in` per keyword
+        hit_words = pos_words + neg_words
+        hit_re = _any_of(hit_words)
+        neg_re = _any_of(neg_words)
+
+        hit_idx, last_idx, any_negative = _scan_step(hit_re, hit_words, neg_re, blob, line_starts, lows, msgs)
+
+        ev_hits: List[Dict[str, Any]] = [
+            {"timestamp": tss[i], "component": comps[i], "message": msgs[i]} for i in hit_idx
+        ]
+
+        # Fail on any negative hit, or when nothing matched at all
+        status = "Fail" if any_negative or not ev_hits else "Pass"
 
         if status == "Pass":
             pass_count += 1
@@ -145,7 +260,7 @@ def validate_plan(plan: Dict[str, Any] | List[Dict[str, Any]], events: List[Any]
 
         # Timestamps for first/last evidence
         first_hit_time = ev_hits[0]["timestamp"] if ev_hits else None
-        last_hit_time = ev_hits[-1]["timestamp"] if ev_hits else None
+        last_hit_time = tss[last_idx] if last_idx is not None else None
 
         result["steps"].append({
             "Step": idx + 1,
@@ -153,7 +268,7 @@ def validate_plan(plan: Dict[str, Any] | List[Dict[str, Any]], events: List[Any]
             "Expected Result": expected.strip(),
             "Status": status,
             "phase": phase,
-            "evidence": ev_hits[:3],  # limit evidence in payload
+            "evidence": ev_hits,
             "first_hit_time": first_hit_time,
             "last_hit_time": last_hit_time,
         })
@@ -0,0 +1,86 @@
+import json
+import os
+
+import pytest
+
+import test_plan
+
+PLANS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plans")
+
+
+class Ev:
+    def __init__(self, ts, sev, comp, msg):
+        self.timestamp = ts
+        self.severity = sev
+        self.component = comp
+        self.message = msg
+
+
+def _reference_steps(plan, events):
+    """The original per-event matcher: (Status, evidence, first_hit_time, last_hit_time) per step."""
+    steps = plan if isinstance(plan, list) else plan.get("steps", [])
+    out = []
+    for step in steps:
+        text = (step.get("Step Action") or step.get("name") or "").lower()
+        keywords = [kw.lower() for kw in step.get("keywords", []) or [] if kw]
+        negatives = [kw.lower() for kw in step.get("negative_patterns", []) or [] if kw]
+        hits = []
+        for ev in events:
+            low = " ".join([str(ev.timestamp), str(ev.component), str(ev.severity), str(ev.message)]).lower()
+            if (text and text in low) or any(kw in low for kw in keywords + negatives):
+                hits.append({"timestamp": str(ev.timestamp), "component": str(ev.component), "message": str(ev.message)})
+        negative = any(kw in h["message"].lower() for h in hits for kw in negatives)
+        status = "Pass" if hits and not negative else "Fail"
+        out.append((status, hits[:3], hits[0]["timestamp"] if hits else None, hits[-1]["timestamp"] if hits else None))
+    return out
+
+
+def _events_for(plan):
+    """Hits for most steps (some repeated, some upper-cased), with noise between."""
+    events = []
+    for i, step in enumerate(plan["steps"]):
+        keywords = step.get("keywords") or []
+        for j, kw in enumerate(keywords[: i % 4]):
+            events.append(Ev(f"2025-01-01 10:{i:02d}:{j:02d}", "INFO", "Setup", f"step {i}: {kw.upper() if j % 2 else kw}"))
+            events.append(Ev(f"2025-01-01 10:{i:02d}:{j:02d}.5", "WARNING", "Agent", "heartbeat"))
+        if i % 5 == 0:
+            events.append(Ev(f"2025-01-01 11:{i:02d}:00", "ERROR", "Setup", f"retry: {step['name']}"))
+    return events
+
+
+def _assert_matches_reference(plan, events):
+    result = test_plan.validate_plan(plan, events, plan_name="p")
+    got = [(s["Status"], s["evidence"], s["first_hit_time"], s["last_hit_time"]) for s in result["steps"]]
+    expected = _reference_steps(plan, events)
+    assert got == expected
+    assert result["summary"]["pass_count"] == sum(status == "Pass" for status, *_ in expected)
+    assert result["summary"]["fail_count"] == sum(status == "Fail" for status, *_ in expected)
+
+
+@pytest.mark.parametrize("plan_file", ["dash_test_plan.json", "softpaq_test_plan.json"])
+def test_validate_plan_matches_reference_on_sample_plans(plan_file):
+    with open(os.path.join(PLANS_DIR, plan_file), encoding="utf-8") as f:
+        plan = json.load(f)
+    events = _events_for(plan)
+
+    _assert_matches_reference(plan, events)
+    # Negative patterns fail a step even when its keywords also hit
+    plan["steps"][1]["negative_patterns"] = ["heartbeat", "retry"]
+    _assert_matches_reference(plan, events)
+
+
+def test_validate_plan_keyword_with_line_separator():
+    # The matcher joins lines with NUL; a keyword containing it must not match across two events
+    events = [
+        Ev("t1", "INFO", "Setup", "download a"),
+        Ev("t2", "INFO", "Setup", "b done"),
+        Ev("t3", "INFO", "Setup", "payload x\x00y"),
+    ]
+    plan = [
+        {"name": "span", "keywords": ["a\x00t2"]},
+        {"name": "inside", "keywords": ["x\x00y"]},
+        {"name": "done"},  # keeps the second event in the prefiltered corpus
+    ]
+    _assert_matches_reference(plan, events)
+    result = test_plan.validate_plan(plan, events)
+    assert [s["Status"] for s in result["steps"]] == ["Fail", "Pass", "Pass"]
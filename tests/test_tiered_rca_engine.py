@@ -0,0 +1,92 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+LLM_TEXT = "Root cause: driver error. Recommendation: reinstall the package. " * 10
+
+
+class Ev:
+    def __init__(self, msg):
+        self.timestamp = "2025-01-01 00:00:00"
+        self.severity = "ERROR"
+        self.component = "Setup"
+        self.message = msg
+
+
+@pytest.fixture
+def stubbed_engine(monkeypatch):
+    """tiered_rca_engine with rules scoring low, the ML model failing and the LLM settling the session."""
+    import ai_rca
+    monkeypatch.setattr(ai_rca, "analyze_with_ai", lambda *a, **k: LLM_TEXT, raising=False)
+    import tiered_rca_engine as mod
+
+    monkeypatch.setattr(mod, "get_all_rca_summaries", lambda events, metadata, context: [])
+    monkeypatch.setattr(mod, "_ML_MODELS", (("model", lambda events: None),))
+    llm_calls = []
+
+    def fake_llm(*args, **kwargs):
+        llm_calls.append(kwargs.get("offline"))
+        return LLM_TEXT
+
+    monkeypatch.setattr(mod, "analyze_with_ai", fake_llm)
+    return mod, llm_calls
+
+
+def _engine(mod, **overrides):
+    config = mod.TieredRCAEngine()._default_config()
+    config.update(overrides)
+    return mod.TieredRCAEngine(config)
+
+
+def test_result_cache_hit_returns_stored_result(stubbed_engine):
+    mod, llm_calls = stubbed_engine
+    engine = _engine(mod, enable_result_cache=True)
+    events = [Ev("install failed")]
+
+    _, first = engine.analyze(events, {}, {})
+    _, second = engine.analyze(events, {}, {})
+
+    assert first.results[-1].tier == mod.DiagnosticTier.LOCAL_LLM
+    assert second.results[-1] is first.results[-1]
+    assert len(llm_calls) == 1
+
+    # New objects with the same content hit the cache
+    _, third = engine.analyze([Ev("install failed")], {}, {})
+    assert third.results[-1] is first.results[-1]
+    assert len(llm_calls) == 1
+
+    # Different content misses, even when a dropped list's objects may be reused
+    del events
+    engine.analyze([Ev("disk full")], {}, {})
+    engine.analyze([Ev("driver crash")], {}, {})
+    assert len(llm_calls) == 3
+
+
+def test_tier_past_deadline_reports_deadline_exceeded(stubbed_engine, monkeypatch):
+    mod, _ = stubbed_engine
+    release = threading.Event()
+    monkeypatch.setattr(mod, "analyze_with_ai", lambda *a, **k: release.wait(5) and LLM_TEXT)
+    engine = _engine(mod, session_timeout_s=0.2)
+    try:
+        outcome, snapshot = engine.analyze([Ev("install failed")], {}, {})
+    finally:
+        release.set()
+
+    llm = snapshot.results[-1]
+    assert llm.tier == mod.DiagnosticTier.LOCAL_LLM
+    assert llm.error_message == "deadline exceeded"
+    assert llm.confidence_score == 0.0
+    assert outcome is None
+
+
+def test_evicted_sessions_exported_exactly_once(stubbed_engine, tmp_path):
+    mod, _ = stubbed_engine
+    engine = _engine(mod, in_memory_sessions=2, session_archive_path=str(tmp_path / "sessions.jsonl"))
+    ids = [engine.analyze([Ev(f"error {i}")], {}, {})[1].session_id for i in range(5)]
+
+    assert len(engine.session_history) == 2
+    exported = list(engine.export_audit_trail())
+    assert [record["session_id"] for record in exported] == ids
+    assert all(isinstance(record["timestamp"], datetime) for record in exported)
+    assert exported[0]["diagnostic_path"][0] == "rule_based"
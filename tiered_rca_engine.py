@@ -3,13 +3,29 @@ tiered_rca_engine.py - Multi-tier RCA pipeline with fallback escalation
 Patent Implementation: Claims 1, 2, 4, 7, 9
 """
 
+import asyncio
+import re
 import uuid
 import hashlib
 import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
-from enum import Enum
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from enum import Enum, IntEnum
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
 
 # Import existing modules
 from rca_rules import get_all_rca_summaries
@@ -17,14 +33,69 @@ from ai_rca import analyze_with_ai
 from clustering_model import cluster_events
 from decision_tree_model import analyze_event_severity
 from anomaly_svm import detect_anomalies
+from rca_confidence import calc_genai, calc_llm, calc_ml, calc_rule
+from redaction import _field
+
+logger = logging.getLogger(__name__)
+
+# ML tier models: result key -> model; they are independent, so run together.
+# They run concurrently within and across sessions (_ML_POOL is shared), so
+# they must not use pyplot's global figure state: each draws on its own Figure.
+_ML_MODELS = (
+    ("clustering", cluster_events),
+    ("decision_tree", analyze_event_severity),
+    ("anomaly_detection", detect_anomalies),
+)
+# Shared across engines and calls; worker threads start on first submit
+_ML_POOL = ThreadPoolExecutor(max_workers=len(_ML_MODELS), thread_name_prefix="rca-ml")
+# Runs a speculatively started ML tier alongside the rule tier
+_SPECULATION_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rca-speculate")
+# LLM/GenAI calls run here so analyze can stop waiting at the deadline; a
+# timed-out call is cancelled if still queued, else finishes and is dropped
+_LLM_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rca-llm")
+
+def _json_default(obj):
+    """JSON encoding for values stdlib json can't handle; matches orjson's for enums and datetimes"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+def _dumps_line(record: Dict) -> bytes:
+    """One JSONL line for a serialized session (archive and audit dumps)"""
+    if orjson is not None:
+        return orjson.dumps(record, default=_json_default,
+                            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(record, default=_json_default).encode() + b"\n"
 
-class DiagnosticTier(Enum):
-    RULE_BASED = "rule_based"
-    MACHINE_LEARNING = "machine_learning"
-    LOCAL_LLM = "local_llm"
-    EXTERNAL_GENAI = "external_genai"
+# Event fields that make up an input's content for the result cache
+_DIGEST_FIELDS = ("timestamp", "component", "severity", "message")
 
-@dataclass
+def _events_digest(events: List) -> str:
+    """Content digest of dict or object events, independent of object identity"""
+    h = hashlib.blake2b(digest_size=16)
+    for ev in events:
+        # \x1f between fields and \x1e after each event keep neighbours from running together
+        h.update("\x1f".join(str(_field(ev, name, "")) for name in _DIGEST_FIELDS).encode("utf-8", "surrogatepass"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+class DiagnosticTier(IntEnum):
+    """Escalation tiers; the value is the tier's position in the escalation order"""
+    RULE_BASED = 0
+    MACHINE_LEARNING = 1
+    LOCAL_LLM = 2
+    EXTERNAL_GENAI = 3
+    
+    @property
+    def label(self) -> str:
+        """Stable string name used in serialized sessions"""
+        return _TIER_LABELS[self]
+
+_TIER_LABELS = ("rule_based", "machine_learning", "local_llm", "external_genai")
+
+@dataclass(slots=True)
 class DiagnosticResult:
     tier: DiagnosticTier
     confidence_score: float
@@ -32,8 +103,19 @@ class DiagnosticResult:
     execution_time: float
     error_message: Optional[str] = None
     metadata: Optional[Dict] = None
+    
+    def to_dict(self) -> Dict:
+        """Shallow serializable form (outcome and metadata are shared, not copied)"""
+        return {
+            "tier": self.tier.label,
+            "confidence_score": self.confidence_score,
+            "outcome": self.outcome,
+            "execution_time": self.execution_time,
+            "error_message": self.error_message,
+            "metadata": self.metadata,
+        }
 
-@dataclass
+@dataclass(slots=True)
 class SessionSnapshot:
     session_id: str
     timestamp: datetime
@@ -43,6 +125,19 @@ class SessionSnapshot:
     final_outcome: Any
     redaction_applied: bool
     compliance_tags: List[str]
+    
+    def to_dict(self) -> Dict:
+        """Shallow serializable form; tiers appear by label"""
+        return {
+            "session_id": self.session_id,
+            "timestamp": self.timestamp,
+            "input_hash": self.input_hash,
+            "diagnostic_path": [tier.label for tier in self.diagnostic_path],
+            "results": [result.to_dict() for result in self.results],
+            "final_outcome": self.final_outcome,
+            "redaction_applied": self.redaction_applied,
+            "compliance_tags": self.compliance_tags,
+        }
 
 class TieredRCAEngine:
     """
@@ -50,9 +145,40 @@ class TieredRCAEngine:
     Implements patent claims for autonomous RCA with traceability
     """
     
+    # Redaction markers: "[REDACTED]", "***", "XXXXX", "<MASKED>"
+    _REDACTION_RE = re.compile(r"\[REDACTED\]|\*\*\*|XXXXX|<MASKED>")
+    
+    # Compliance tags: (user_context key, tag, values that trigger the tag)
+    _TAG_RULES: List[Tuple[str, str, frozenset]] = [
+        ("test_environment", "production_analysis", frozenset({"Production"})),
+        ("issue_severity", "critical_incident", frozenset({"High - System Down", "Critical - Data Loss"})),
+        ("business_impact", "business_critical", frozenset({"High - Revenue Impact", "Critical - Business Stoppage"})),
+    ]
+    
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or self._default_config()
-        self.session_history: List[SessionSnapshot] = []
+        # Most recent sessions only; older ones are archived to disk on eviction
+        max_sessions = self.config.get("in_memory_sessions", 1000)
+        self.session_history: deque = deque(maxlen=max_sessions)
+        # Start time of each session_history entry; both stay sorted by it so
+        # audit exports can bisect a date window
+        self._timestamps: deque = deque(maxlen=max_sessions)
+        self._history_lock = threading.Lock()
+        # Evicted snapshots waiting for the archive writer thread (started on first eviction)
+        self._persist_queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._warned_no_archive = False
+        # session_id -> snapshot, kept in step with session_history for audit lookups
+        self._session_index: Dict[str, SessionSnapshot] = {}
+        # (events-count bucket, issue severity) -> [sessions, sessions settled by rules]
+        self._tier_stats: Dict[Tuple[int, str], List[int]] = {}
+        # Escalation settings indexed by tier value, read once from config
+        thresholds = self.config["confidence_thresholds"]
+        self._thresholds = [thresholds.get(tier, 0.8) for tier in DiagnosticTier]
+        self._max_tier_idx = int(self.config.get("max_tier", DiagnosticTier.LOCAL_LLM))
+        # "<input digest>:<tier>" -> successful DiagnosticResult, least recently used first
+        self._result_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
         
     def _default_config(self) -> Dict:
         """Default configuration for tier thresholds and escalation rules"""
@@ -66,7 +192,28 @@ class TieredRCAEngine:
             "max_tier": DiagnosticTier.LOCAL_LLM,  # Configurable ceiling
             "enable_genai_fallback": False,
             "session_retention_days": 90,
-            "compliance_mode": True
+            "compliance_mode": True,
+            # Sessions kept in memory; older ones are appended to session_archive_path.
+            # The archive holds full outcomes (LLM text included), so it must be set
+            # explicitly; without it evicted sessions are dropped
+            "in_memory_sessions": 1000,
+            "session_archive_path": None,
+            # Start the ML tier alongside rules when P(rules suffice) is below this
+            "speculation_threshold": 0.5,
+            # Sessions analyze_many runs at once (bounds concurrent LLM/GenAI calls)
+            "max_parallel_sessions": 4,
+            # Wall-clock budget per analyze(); no further tiers start once it is spent
+            "session_timeout_s": 30,
+            # Reuse tier results when the same events, metadata and context are analyzed again
+            "enable_result_cache": False,
+            "result_cache_size": 256,
+            # Per-tier waits, further capped by what is left of the session budget.
+            # Rules run inline and are only bounded by the session check.
+            "tier_timeouts_s": {
+                DiagnosticTier.MACHINE_LEARNING: 5.0,
+                DiagnosticTier.LOCAL_LLM: 20.0,
+                DiagnosticTier.EXTERNAL_GENAI: 20.0
+            }
         }
     
     def analyze(self, events: List, metadata: Dict, user_context: Dict) -> Tuple[Any, SessionSnapshot]:
@@ -76,6 +223,7 @@ class TieredRCAEngine:
         """
         session_id = str(uuid.uuid4())
         start_time = datetime.now()
+        deadline = time.perf_counter() + self.config.get("session_timeout_s", 30)
         
         # Create input hash for traceability
         input_data = {
@@ -83,22 +231,50 @@ class TieredRCAEngine:
             "metadata": metadata,
             "context": user_context
         }
-        input_hash = hashlib.sha256(json.dumps(input_data, sort_keys=True).encode()).hexdigest()
+        # blake2b-256 over the canonical JSON (same digest length as SHA-256);
+        # default=str keeps non-JSON metadata such as datetimes from raising
+        input_hash = hashlib.blake2b(
+            json.dumps(input_data, sort_keys=True, default=str).encode(), digest_size=32
+        ).hexdigest()
         
         diagnostic_path = []
         results = []
         final_outcome = None
         
+        # input_hash only counts events, so the cache key also digests their content
+        cache_key = None
+        if self.config.get("enable_result_cache"):
+            cache_key = f"{input_hash}:{_events_digest(events)}"
+        
+        # Inputs like this one usually escalate past rules: start the ML tier
+        # now so it runs concurrently with rule evaluation
+        input_class = self._input_class(events, user_context)
+        ml_future = None
+        if (self._get_next_tier(DiagnosticTier.RULE_BASED) == DiagnosticTier.MACHINE_LEARNING
+                and self._predict_rule_success(input_class) < self.config.get("speculation_threshold", 0.5)):
+            ml_future = _SPECULATION_POOL.submit(
+                self._execute_tier, DiagnosticTier.MACHINE_LEARNING, events, metadata, user_context,
+                deadline, cache_key
+            )
+        
         # Start with rule-based tier
         current_tier = DiagnosticTier.RULE_BASED
         
-        while current_tier and not self._is_sufficient_confidence(results):
+        # Only the newest result can newly meet its threshold (failures score 0.0),
+        # so checking it on append replaces rescanning every result per iteration
+        while current_tier is not None:
+            if time.perf_counter() >= deadline:
+                # Out of budget: settle for the best result so far
+                break
             try:
-                result = self._execute_tier(current_tier, events, metadata, user_context)
+                if current_tier == DiagnosticTier.MACHINE_LEARNING and ml_future is not None:
+                    result, ml_future = ml_future.result(), None
+                else:
+                    result = self._execute_tier(current_tier, events, metadata, user_context, deadline, cache_key)
                 results.append(result)
                 diagnostic_path.append(current_tier)
                 
-                if result.confidence_score >= self.config["confidence_thresholds"][current_tier]:
+                if result.confidence_score >= self._thresholds[result.tier]:
                     final_outcome = result.outcome
                     break
                     
@@ -117,6 +293,12 @@ class TieredRCAEngine:
                 results.append(failed_result)
                 current_tier = self._get_next_tier(current_tier)
         
+        if ml_future is not None:
+            # Rules converged: drop the speculative ML run (a running one just finishes unused)
+            ml_future.cancel()
+        with self._history_lock:  # sessions may run concurrently (analyze_many)
+            self._record_rule_outcome(input_class, results)
+        
         # Create session snapshot
         snapshot = SessionSnapshot(
             session_id=session_id,
@@ -130,52 +312,201 @@ class TieredRCAEngine:
         )
         
         # Store for audit trail
-        self.session_history.append(snapshot)
+        self._store_session(snapshot)
         
         return final_outcome, snapshot
     
-    def _execute_tier(self, tier: DiagnosticTier, events: List, metadata: Dict, user_context: Dict) -> DiagnosticResult:
+    async def analyze_async(self, events: List, metadata: Dict, user_context: Dict,
+                            semaphore: Optional[asyncio.Semaphore] = None) -> Tuple[Any, SessionSnapshot]:
+        """analyze() on a worker thread, so the event loop can run other sessions meanwhile"""
+        if semaphore is None:
+            return await asyncio.to_thread(self.analyze, events, metadata, user_context)
+        async with semaphore:
+            return await asyncio.to_thread(self.analyze, events, metadata, user_context)
+    
+    async def analyze_many(self, jobs: List[Tuple[List, Dict, Dict]]) -> List[Tuple[Any, SessionSnapshot]]:
+        """
+        Analyze several (events, metadata, user_context) jobs concurrently, at most
+        config["max_parallel_sessions"] at a time. Results are in job order.
+        From synchronous code: asyncio.run(engine.analyze_many(jobs))
+        """
+        semaphore = asyncio.Semaphore(self.config.get("max_parallel_sessions", 4))
+        return list(await asyncio.gather(
+            *(self.analyze_async(events, metadata, user_context, semaphore)
+              for events, metadata, user_context in jobs)
+        ))
+    
+    def _store_session(self, snapshot: SessionSnapshot) -> None:
+        """Add a snapshot to the in-memory history, archiving the oldest one when full"""
+        with self._history_lock:
+            if len(self.session_history) == self.session_history.maxlen:
+                # deque.insert refuses to grow past maxlen, so evict first
+                evicted = self.session_history.popleft()
+                self._timestamps.popleft()
+                self._session_index.pop(evicted.session_id, None)
+                self._archive(evicted)
+            # An append unless a concurrent, earlier-started session finished later
+            pos = bisect_right(self._timestamps, snapshot.timestamp)
+            self._timestamps.insert(pos, snapshot.timestamp)
+            self.session_history.insert(pos, snapshot)
+            self._session_index[snapshot.session_id] = snapshot
+    
+    def _archive(self, snapshot: SessionSnapshot) -> None:
+        """Hand an evicted snapshot to the background writer"""
+        if not self.config.get("session_archive_path"):
+            if not self._warned_no_archive:
+                logger.warning("No session_archive_path configured; RCA sessions evicted from memory are dropped")
+                self._warned_no_archive = True
+            return
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._snapshot_writer, daemon=True,
+                                            name="rca-archive")
+            self._writer.start()
+        self._persist_queue.put(snapshot.to_dict())
+    
+    def _snapshot_writer(self) -> None:
+        """Append evicted sessions to the archive, one JSON line each, in batches"""
+        path = self.config["session_archive_path"]
+        while True:
+            batch = [self._persist_queue.get()]
+            while True:
+                try:
+                    batch.append(self._persist_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                # Single write per batch on an O_APPEND file; readers skip a torn last line
+                with open(path, "ab") as f:
+                    f.write(b"".join(_dumps_line(r) for r in batch))
+            except Exception as e:
+                logger.warning("Failed to archive %d RCA sessions: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._persist_queue.task_done()
+    
+    def flush_archive(self) -> None:
+        """Block until every evicted session has been written to the archive"""
+        self._persist_queue.join()
+    
+    def _archived_sessions(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> Iterator[Dict]:
+        """Archived session records within the window, timestamps parsed back to datetime"""
+        path = self.config.get("session_archive_path")
+        if not path or not os.path.exists(path):
+            return
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                    ts = datetime.fromisoformat(record["timestamp"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if (start_date is None or ts >= start_date) and (end_date is None or ts <= end_date):
+                    # Same shape as an in-memory session's to_dict()
+                    record["timestamp"] = ts
+                    yield record
+    
+    def _input_class(self, events: List, user_context: Dict) -> Tuple[int, str]:
+        """Coarse input profile for tier history: log2 events-count bucket and issue severity"""
+        return len(events).bit_length(), str(user_context.get("issue_severity", ""))
+    
+    def _predict_rule_success(self, input_class: Tuple[int, str]) -> float:
+        """
+        Share of past sessions of this input class settled by the rule tier.
+        With no history, rules are assumed to suffice (no speculation).
+        Speculating pays off when p_escalate * G > p_rule * C; taking the ML
+        latency saved (G) and the ML work wasted (C) as equal, that is p_rule < 0.5.
+        """
+        seen, settled = self._tier_stats.get(input_class, (0, 0))
+        return settled / seen if seen else 1.0
+    
+    def _record_rule_outcome(self, input_class: Tuple[int, str], results: List[DiagnosticResult]) -> None:
+        """Update the tier history with whether rules alone settled this session"""
+        stats = self._tier_stats.setdefault(input_class, [0, 0])
+        stats[0] += 1
+        first = results[0] if results else None
+        if (first is not None and first.tier == DiagnosticTier.RULE_BASED
+                and first.confidence_score >= self._thresholds[DiagnosticTier.RULE_BASED]):
+            stats[1] += 1
+    
+    def _tier_timeout(self, tier: DiagnosticTier, deadline: Optional[float]) -> Optional[float]:
+        """Seconds this tier may wait: its own limit, capped by the session deadline (None = unbounded)"""
+        timeout = self.config.get("tier_timeouts_s", {}).get(tier)
+        if deadline is not None:
+            remaining = max(deadline - time.perf_counter(), 0.0)
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+    
+    def _execute_tier(self, tier: DiagnosticTier, events: List, metadata: Dict, user_context: Dict,
+                      deadline: Optional[float] = None, cache_key: Optional[str] = None) -> DiagnosticResult:
         """Execute specific diagnostic tier and return result with confidence"""
-        start_time = datetime.now()
+        if cache_key is not None:
+            cache_key = f"{cache_key}:{tier.value}"
+            with self._cache_lock:
+                cached = self._result_cache.get(cache_key)
+                if cached is not None:
+                    self._result_cache.move_to_end(cache_key)
+                    return cached
+        
+        start_time = time.perf_counter()
+        timeout = self._tier_timeout(tier, deadline)
         
         try:
             if tier == DiagnosticTier.RULE_BASED:
                 outcome = get_all_rca_summaries(events, metadata, user_context)
-                confidence = self._calculate_rule_confidence(outcome)
+                confidence = calc_rule(outcome)
                 
             elif tier == DiagnosticTier.MACHINE_LEARNING:
-                # Combine ML insights
-                ml_results = {
-                    "clustering": cluster_events(events),
-                    "decision_tree": analyze_event_severity(events),
-                    "anomaly_detection": detect_anomalies(events)
-                }
+                # Combine ML insights; a failing or late model leaves None and the others still count
+                futures = {name: _ML_POOL.submit(model, events) for name, model in _ML_MODELS}
+                done, not_done = wait(futures.values(), timeout=timeout)
+                for future in not_done:
+                    # Frees the slot if it hasn't started; a running model can't be interrupted
+                    future.cancel()
+                ml_results = {}
+                for name, future in futures.items():
+                    try:
+                        ml_results[name] = future.result() if future in done else None
+                    except Exception:
+                        ml_results[name] = None
                 outcome = ml_results
-                confidence = self._calculate_ml_confidence(ml_results)
+                confidence = calc_ml(ml_results)
                 
             elif tier == DiagnosticTier.LOCAL_LLM:
-                outcome = analyze_with_ai(events, metadata, None, user_context, offline=True)
-                confidence = self._calculate_llm_confidence(outcome)
+                outcome = self._call_llm(events, metadata, user_context, True, timeout)
+                confidence = calc_llm(outcome)
                 
             elif tier == DiagnosticTier.EXTERNAL_GENAI:
-                outcome = analyze_with_ai(events, metadata, None, user_context, offline=False)
-                confidence = self._calculate_genai_confidence(outcome)
+                outcome = self._call_llm(events, metadata, user_context, False, timeout)
+                confidence = calc_genai(outcome)
                 
             else:
                 raise ValueError(f"Unknown tier: {tier}")
             
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
             
-            return DiagnosticResult(
+            result = DiagnosticResult(
                 tier=tier,
                 confidence_score=confidence,
                 outcome=outcome,
                 execution_time=execution_time,
                 metadata={"events_processed": len(events)}
             )
+            if cache_key is not None and confidence > 0:
+                self._cache_result(cache_key, result)
+            return result
+            
+        except TimeoutError:
+            return DiagnosticResult(
+                tier=tier,
+                confidence_score=0.0,
+                outcome=None,
+                execution_time=time.perf_counter() - start_time,
+                error_message="deadline exceeded"
+            )
             
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
             return DiagnosticResult(
                 tier=tier,
                 confidence_score=0.0,
@@ -184,79 +515,40 @@ class TieredRCAEngine:
                 error_message=str(e)
             )
     
-    def _calculate_rule_confidence(self, outcome: List) -> float:
-        """Calculate confidence for rule-based results"""
-        if not outcome:
-            return 0.1
-        
-        # Higher confidence for more specific matches
-        specificity_score = min(len(outcome) * 0.2, 0.8)
-        base_confidence = 0.6 if outcome else 0.1
-        
-        return min(base_confidence + specificity_score, 1.0)
-    
-    def _calculate_ml_confidence(self, ml_results: Dict) -> float:
-        """Calculate confidence for ML results"""
-        valid_results = sum(1 for result in ml_results.values() if result is not None)
-        total_models = len(ml_results)
-        
-        if total_models == 0:
-            return 0.1
-            
-        # Confidence based on model agreement
-        return min(0.5 + (valid_results / total_models) * 0.3, 0.85)
-    
-    def _calculate_llm_confidence(self, outcome: str) -> float:
-        """Calculate confidence for LLM results"""
-        if not outcome or len(outcome) < 100:
-            return 0.3
-        
-        # Simple heuristic based on response completeness
-        confidence_indicators = [
-            "root cause" in outcome.lower(),
-            "recommendation" in outcome.lower(),
-            len(outcome) > 500,
-            "error" in outcome.lower() or "critical" in outcome.lower()
-        ]
-        
-        return min(0.6 + sum(confidence_indicators) * 0.1, 0.9)
+    def _call_llm(self, events: List, metadata: Dict, user_context: Dict, offline: bool,
+                  timeout: Optional[float]) -> Any:
+        """Run analyze_with_ai on the LLM pool, waiting at most timeout seconds"""
+        future = _LLM_POOL.submit(analyze_with_ai, events, metadata, None, user_context, offline=offline)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # A call still queued must not start later and hold a worker for a
+            # session that has given up on it; a running call can't be interrupted
+            future.cancel()
+            raise
     
-    def _calculate_genai_confidence(self, outcome: str) -> float:
-        """Calculate confidence for external GenAI results"""
-        # Assume higher confidence for external AI
-        return min(self._calculate_llm_confidence(outcome) + 0.1, 0.95)
+    def _cache_result(self, key: str, result: DiagnosticResult) -> None:
+        """Store a tier result, evicting the least recently used beyond result_cache_size"""
+        with self._cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > self.config.get("result_cache_size", 256):
+                self._result_cache.popitem(last=False)
     
     def _get_next_tier(self, current_tier: DiagnosticTier) -> Optional[DiagnosticTier]:
         """Determine next escalation tier"""
-        tier_order = [
-            DiagnosticTier.RULE_BASED,
-            DiagnosticTier.MACHINE_LEARNING,
-            DiagnosticTier.LOCAL_LLM,
-            DiagnosticTier.EXTERNAL_GENAI
-        ]
-        
-        try:
-            current_index = tier_order.index(current_tier)
-            if current_index + 1 < len(tier_order):
-                next_tier = tier_order[current_index + 1]
-                
-                # Check configuration limits
-                if next_tier == DiagnosticTier.EXTERNAL_GENAI and not self.config["enable_genai_fallback"]:
-                    return None
-                    
-                max_tier_index = tier_order.index(self.config["max_tier"])
-                if tier_order.index(next_tier) <= max_tier_index:
-                    return next_tier
-                    
-        except (ValueError, IndexError):
-            pass
-            
-        return None
+        nxt = current_tier + 1
+        if nxt > self._max_tier_idx or nxt >= len(DiagnosticTier):
+            return None
+        # Check configuration limits
+        if nxt == DiagnosticTier.EXTERNAL_GENAI and not self.config["enable_genai_fallback"]:
+            return None
+        return DiagnosticTier(nxt)
     
     def _is_sufficient_confidence(self, results: List[DiagnosticResult]) -> bool:
-        """Check if any result meets confidence threshold"""
+        """Check if any result meets confidence threshold (analyze checks each result as it lands)"""
         for result in results:
-            if result.confidence_score >= self.config["confidence_thresholds"].get(result.tier, 0.8):
+            if result.confidence_score >= self._thresholds[result.tier]:
                 return True
         return False
     
@@ -273,43 +565,63 @@ class TieredRCAEngine:
     
     def _detect_redaction(self, events: List) -> bool:
         """Detect if logs contain redacted content"""
-        redaction_patterns = ["[REDACTED]", "***", "XXXXX", "<MASKED>"]
-        
-        for event in events[:50]:  # Sample first 50 events
-            message = getattr(event, 'message', '')
-            if any(pattern in message for pattern in redaction_patterns):
+        search = self._REDACTION_RE.search
+        sample = islice(events, 50)  # Sample first 50 events
+        first = next(sample, None)
+        if first is None:
+            return False
+        sample = chain((first,), sample)
+        # Events are all dicts or all objects; pick the accessor once
+        if isinstance(first, dict):
+            messages = (event.get('message') for event in sample)
+        else:
+            messages = (getattr(event, 'message', None) for event in sample)
+        for msg in messages:
+            if msg and search(msg):
                 return True
         return False
     
     def _generate_compliance_tags(self, user_context: Dict) -> List[str]:
         """Generate compliance tags based on context"""
         tags = ["rca_session"]
-        
-        if user_context.get("test_environment") == "Production":
-            tags.append("production_analysis")
-        
-        if user_context.get("issue_severity") in ["High - System Down", "Critical - Data Loss"]:
-            tags.append("critical_incident")
-            
-        if user_context.get("business_impact") in ["High - Revenue Impact", "Critical - Business Stoppage"]:
-            tags.append("business_critical")
-            
+        for key, tag, values in self._TAG_RULES:
+            if user_context.get(key) in values:
+                tags.append(tag)
         return tags
     
     def get_session_by_id(self, session_id: str) -> Optional[SessionSnapshot]:
-        """Retrieve session snapshot by ID for audit purposes"""
-        for snapshot in self.session_history:
-            if snapshot.session_id == session_id:
-                return snapshot
-        return None
+        """Retrieve an in-memory session snapshot by ID for audit purposes"""
+        return self._session_index.get(session_id)
     
-    def export_audit_trail(self, start_date: datetime = None, end_date: datetime = None) -> List[Dict]:
-        """Export audit trail for compliance reporting"""
-        filtered_sessions = self.session_history
-        
-        if start_date:
-            filtered_sessions = [s for s in filtered_sessions if s.timestamp >= start_date]
-        if end_date:
-            filtered_sessions = [s for s in filtered_sessions if s.timestamp <= end_date]
-            
-        return [asdict(session) for session in filtered_sessions]
+    def export_audit_trail(self, start_date: datetime = None, end_date: datetime = None) -> Iterator[Dict]:
+        """
+        Export audit trail for compliance reporting.
+        Yields one serialized session at a time, oldest first; wrap in list() if needed.
+        Sessions evicted from memory are read back from the archive when the
+        window reaches before the oldest in-memory session.
+        """
+        with self._history_lock:
+            oldest = self._timestamps[0] if self._timestamps else None
+            lo = bisect_left(self._timestamps, start_date) if start_date else 0
+            hi = bisect_right(self._timestamps, end_date) if end_date else len(self._timestamps)
+            sessions = list(islice(self.session_history, lo, hi))
+            read_archive = start_date is None or oldest is None or start_date < oldest
+        if read_archive:
+            # Sessions evicted before the snapshot were queued under the lock, so the
+            # flush puts them on disk; later evictions may also land and are skipped
+            self.flush_archive()
+            in_memory = {session.session_id for session in sessions}
+            for record in self._archived_sessions(start_date, end_date):
+                if record["session_id"] not in in_memory:
+                    yield record
+        for session in sessions:
+            yield session.to_dict()
+    
+    def dump_audit_trail(self, path: str, start_date: datetime = None, end_date: datetime = None) -> int:
+        """Stream the audit trail to a JSONL file, one session per line; returns sessions written"""
+        count = 0
+        with open(path, "wb") as f:
+            for record in self.export_audit_trail(start_date, end_date):
+                f.write(_dumps_line(record))
+                count += 1
+        return count
@@ -4,6 +4,88 @@ import streamlit as st
 import pandas as pd
 from typing import Dict, Any, List, Optional
 
+# Rows sent to the browser per page when a table is expanded with "Show all"
+TABLE_PAGE_ROWS = 1000
+
+# HTML blocks, built once at import: static ones are constants, the rest
+# are str.format templates filled per call
+_HEADER_HTML = """
+        <div style='text-align: center; padding: 10px;'>
+            <h4 style='color: #1f77b4; margin: 0;'>Enterprise Log Analysis Platform</h4>
+            <p style='color: #666; margin: 0; font-size: 14px;'>Intelligent diagnostics for system provisioning and deployment</p>
+        </div>
+        """
+
+_INFO_CARD_HTML = """
+    <div style='
+        background-color: {color};
+        border-left: 4px solid #1f77b4;
+        padding: 15px;
+        margin: 10px 0;
+        border-radius: 5px;
+    '>
+        <h4 style='margin: 0 0 10px 0; color: #1f77b4;'>{icon} {title}</h4>
+        <p style='margin: 0; color: #333;'>{content}</p>
+    </div>
+    """
+
+_METRIC_CARD_HTML = """
+            <div style='
+                background-color: white;
+                border: 1px solid #dee2e6;
+                border-radius: 8px;
+                padding: 20px;
+                text-align: center;
+                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            '>
+                <h3 style='color: #1f77b4; margin: 0;'>{value}</h3>
+                <p style='color: #666; margin: 5px 0 0 0; font-size: 14px;'>{key}</p>
+            </div>
+            """
+
+_STATUS_BADGE_HTML = """
+    <span style='
+        background-color: {color};
+        color: white;
+        padding: 4px 12px;
+        border-radius: 20px;
+        font-size: 12px;
+        font-weight: bold;
+        margin-right: 10px;
+    '>{status}</span>
+    <span style='color: #666; font-size: 14px;'>{message}</span>
+    """
+
+_WELCOME_HTML = """
+    <div style='text-align: center; padding: 40px 20px;'>
+        <h1 style='color: #1f77b4; margin-bottom: 20px;'>LogSense</h1>
+        <h3 style='color: #666; font-weight: normal; margin-bottom: 30px;'>
+            Enterprise Log Analysis Platform
+        </h3>
+    </div>
+    """
+
+_WELCOME_FEATURES_HTML = (
+    """
+        <div style='text-align: center; padding: 20px;'>
+            <h4 style='color: #1f77b4;'>Intelligent Analysis</h4>
+            <p style='color: #666;'>AI-powered root cause analysis with pattern recognition and anomaly detection.</p>
+        </div>
+        """,
+    """
+        <div style='text-align: center; padding: 20px;'>
+            <h4 style='color: #1f77b4;'>Privacy First</h4>
+            <p style='color: #666;'>All analysis happens locally. Your data never leaves your environment.</p>
+        </div>
+        """,
+    """
+        <div style='text-align: center; padding: 20px;'>
+            <h4 style='color: #1f77b4;'>Rich Insights</h4>
+            <p style='color: #666;'>Interactive dashboards, timeline analysis, and comprehensive reporting.</p>
+        </div>
+        """,
+)
+
 def render_header():
     """Render professional header with branding and navigation."""
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -12,12 +94,7 @@ def render_header():
         st.markdown("### [SEARCH] LogSense")
     
     with col2:
-        st.markdown("""
-        <div style='text-align: center; padding: 10px;'>
-            <h4 style='color: #1f77b4; margin: 0;'>Enterprise Log Analysis Platform</h4>
-            <p style='color: #666; margin: 0; font-size: 14px;'>Intelligent diagnostics for system provisioning and deployment</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     with col3:
         st.markdown(f"""
@@ -58,18 +135,7 @@ def render_progress_indicator(current_step: int, total_steps: int = 5):
 
 def render_info_card(title: str, content: str, icon: str = "[U+2139][U+FE0F]", color: str = "#e3f2fd"):
     """Render information card with professional styling."""
-    st.markdown(f"""
-    <div style='
-        background-color: {color};
-        border-left: 4px solid #1f77b4;
-        padding: 15px;
-        margin: 10px 0;
-        border-radius: 5px;
-    '>
-        <h4 style='margin: 0 0 10px 0; color: #1f77b4;'>{icon} {title}</h4>
-        <p style='margin: 0; color: #333;'>{content}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_INFO_CARD_HTML.format(color=color, icon=icon, title=title, content=content), unsafe_allow_html=True)
 
 def render_metric_cards(metrics: Dict[str, Any]):
     """Render key metrics in card format."""
@@ -77,19 +143,7 @@ def render_metric_cards(metrics: Dict[str, Any]):
     
     for i, (key, value) in enumerate(metrics.items()):
         with cols[i]:
-            st.markdown(f"""
-            <div style='
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-                padding: 20px;
-                text-align: center;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            '>
-                <h3 style='color: #1f77b4; margin: 0;'>{value}</h3>
-                <p style='color: #666; margin: 5px 0 0 0; font-size: 14px;'>{key}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_METRIC_CARD_HTML.format(key=key, value=value), unsafe_allow_html=True)
 
 def render_status_badge(status: str, message: str = ""):
     """Render status badge with appropriate styling."""
@@ -103,18 +157,29 @@ def render_status_badge(status: str, message: str = ""):
     
     color = colors.get(status.lower(), "#6c757d")
     
-    st.markdown(f"""
-    <span style='
-        background-color: {color};
-        color: white;
-        padding: 4px 12px;
-        border-radius: 20px;
-        font-size: 12px;
-        font-weight: bold;
-        margin-right: 10px;
-    '>{status.upper()}</span>
-    <span style='color: #666; font-size: 14px;'>{message}</span>
-    """, unsafe_allow_html=True)
+    st.markdown(_STATUS_BADGE_HTML.format(color=color, status=status.upper(), message=message), unsafe_allow_html=True)
+
+def _search_blob(df: pd.DataFrame, title: str) -> pd.Series:
+    """Each row's cells joined into one string for the table search.
+
+    Built column-wise (vectorized) and cached per table on the frame's content
+    hash, so refining a search does not rebuild it even though callers build
+    a new frame on every rerun.
+    """
+    key = f"search_blob_{title}"
+    try:
+        digest = (tuple(map(str, df.columns)), int(pd.util.hash_pandas_object(df).sum()))
+    except TypeError:  # unhashable cells (lists, dicts): build without caching
+        digest = None
+    cached = st.session_state.get(key)
+    if digest is not None and cached is not None and cached[0] == digest:
+        return cached[1]
+    cols = [df.iloc[:, i].astype(str) for i in range(df.shape[1])]
+    # Unit separator between cells so a term cannot match across two of them
+    blob = cols[0].str.cat(cols[1:], sep="\x1f", na_rep="")
+    if digest is not None:
+        st.session_state[key] = (digest, blob)
+    return blob
 
 def render_data_table(df: pd.DataFrame, title: str, max_height: int = 400):
     """Render data table with professional styling and controls."""
@@ -131,15 +196,25 @@ def render_data_table(df: pd.DataFrame, title: str, max_height: int = 400):
     with col2:
         show_all = st.checkbox(f"Show all {len(df)} rows", key=f"show_all_{title}")
     
-    # Apply search filter
+    # Apply search filter: one literal, case-insensitive scan per row
     if search_term:
-        mask = df.astype(str).apply(lambda x: x.str.contains(search_term, case=False, na=False)).any(axis=1)
-        df = df[mask]
+        mask = _search_blob(df, title).str.contains(search_term, case=False, regex=False, na=False)
+        df = df[mask.to_numpy()]
     
-    # Display table with styling
-    if not show_all and len(df) > 20:
+    # Display table with styling; only the visible slice is serialized
+    total = len(df)
+    if not show_all and total > 20:
         df = df.head(20)
-        st.caption(f"Showing first 20 of {len(df)} rows. Check 'Show all' to see more.")
+        st.caption(f"Showing first 20 of {total} rows. Check 'Show all' to see more.")
+    elif total > TABLE_PAGE_ROWS:
+        pages = (total - 1) // TABLE_PAGE_ROWS + 1
+        page = st.number_input(f"Page (1-{pages})", min_value=1, max_value=pages, value=1, key=f"page_{title}")
+        start = (int(page) - 1) * TABLE_PAGE_ROWS
+        df = df.iloc[start:start + TABLE_PAGE_ROWS]
+        st.caption(f"Showing rows {start + 1}-{start + len(df)} of {total}.")
+    
+    # Repetitive label columns go over the wire dictionary-encoded
+    df = df.astype({c: "category" for c in ("Component", "Severity") if c in df.columns})
     
     st.dataframe(
         df,
@@ -206,41 +281,19 @@ def render_sidebar_config():
 
 def render_welcome_screen():
     """Render enhanced welcome screen with better onboarding."""
-    st.markdown("""
-    <div style='text-align: center; padding: 40px 20px;'>
-        <h1 style='color: #1f77b4; margin-bottom: 20px;'>LogSense</h1>
-        <h3 style='color: #666; font-weight: normal; margin-bottom: 30px;'>
-            Enterprise Log Analysis Platform
-        </h3>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_WELCOME_HTML, unsafe_allow_html=True)
     
     # Feature highlights
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown("""
-        <div style='text-align: center; padding: 20px;'>
-            <h4 style='color: #1f77b4;'>Intelligent Analysis</h4>
-            <p style='color: #666;'>AI-powered root cause analysis with pattern recognition and anomaly detection.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_WELCOME_FEATURES_HTML[0], unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
-        <div style='text-align: center; padding: 20px;'>
-            <h4 style='color: #1f77b4;'>Privacy First</h4>
-            <p style='color: #666;'>All analysis happens locally. Your data never leaves your environment.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_WELCOME_FEATURES_HTML[1], unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
-        <div style='text-align: center; padding: 20px;'>
-            <h4 style='color: #1f77b4;'>Rich Insights</h4>
-            <p style='color: #666;'>Interactive dashboards, timeline analysis, and comprehensive reporting.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_WELCOME_FEATURES_HTML[2], unsafe_allow_html=True)
     
     # Quick start section
     st.markdown("---")
@@ -3,7 +3,8 @@ from __future__ import annotations
 import time
 import psutil
 import threading
-from typing import Dict, Any, List, Callable, Optional
+from collections import OrderedDict
+from typing import Any, List, Callable, Optional
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from functools import wraps
@@ -30,18 +31,21 @@ class PerformanceMonitor:
         """Context manager to monitor performance of operations"""
         start_time = time.time()
         start_memory = self.process.memory_info().rss / 1024 / 1024  # MB
-        start_cpu = self.process.cpu_percent()
+        start_cpu = self.process.cpu_times()
         
         try:
             yield
         finally:
             end_time = time.time()
             end_memory = self.process.memory_info().rss / 1024 / 1024  # MB
-            end_cpu = self.process.cpu_percent()
+            end_cpu = self.process.cpu_times()
             
             execution_time = end_time - start_time
             memory_usage = end_memory - start_memory
-            cpu_usage = (start_cpu + end_cpu) / 2
+            # CPU seconds spent during the operation over its wall time; a bare
+            # cpu_percent() call at the start always reads 0.0
+            cpu_seconds = (end_cpu.user + end_cpu.system) - (start_cpu.user + start_cpu.system)
+            cpu_usage = 100.0 * cpu_seconds / execution_time if execution_time > 0 else 0.0
             throughput = event_count / execution_time if execution_time > 0 else 0
             
             metrics = PerformanceMetrics(
@@ -72,6 +76,21 @@ class BatchProcessor:
     def __init__(self, batch_size: int = 1000, max_workers: Optional[int] = None):
         self.batch_size = batch_size
         self.max_workers = max_workers or min(mp.cpu_count(), 8)
+        # Executors are created on first use and reused across calls; close() shuts them down
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+    
+    def _executor(self, use_multiprocessing: bool):
+        """Long-lived thread or process pool for this processor"""
+        with self._pool_lock:
+            if use_multiprocessing:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._thread_pool
         
     def process_in_batches(self, items: List[Any], processor_func: Callable, use_multiprocessing: bool = False) -> List[Any]:
         """Process items in batches with optional multiprocessing"""
@@ -79,17 +98,24 @@ class BatchProcessor:
         results = []
         
         if use_multiprocessing and len(batches) > 1:
-            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                batch_results = list(executor.map(processor_func, batches))
-                for batch_result in batch_results:
-                    results.extend(batch_result)
+            # Ship several batches per worker round-trip to cut IPC overhead
+            chunksize = max(1, len(batches) // (self.max_workers * 4))
+            batch_results = self._executor(True).map(processor_func, batches, chunksize=chunksize)
         else:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                batch_results = list(executor.map(processor_func, batches))
-                for batch_result in batch_results:
-                    results.extend(batch_result)
+            batch_results = self._executor(False).map(processor_func, batches)
+        for batch_result in batch_results:
+            results.extend(batch_result)
         
         return results
+    
+    def close(self):
+        """Shut down the worker pools (e.g. on app exit)"""
+        with self._pool_lock:
+            for pool in (self._thread_pool, self._process_pool):
+                if pool is not None:
+                    pool.shutdown(wait=True)
+            self._thread_pool = None
+            self._process_pool = None
 
 class MemoryOptimizer:
     """Optimize memory usage for large log files"""
@@ -97,21 +123,11 @@ class MemoryOptimizer:
     @staticmethod
     def stream_file_lines(file_path: str, chunk_size: int = 8192):
         """Stream file lines to avoid loading entire file into memory"""
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            buffer = ""
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    if buffer:
-                        yield buffer
-                    break
-                
-                buffer += chunk
-                lines = buffer.split('\n')
-                buffer = lines[-1]  # Keep incomplete line in buffer
-                
-                for line in lines[:-1]:
-                    yield line
+        # The file's own line iterator splits in C (universal newlines, as before);
+        # chunk_size now just sets the read buffer
+        with open(file_path, 'r', encoding='utf-8', errors='ignore', buffering=max(chunk_size, 1024 * 1024)) as f:
+            for line in f:
+                yield line.rstrip('\n')
     
     @staticmethod
     def chunked_processing(items: List[Any], chunk_size: int = 1000):
@@ -128,8 +144,8 @@ class CacheManager:
     """Intelligent caching for expensive operations"""
     
     def __init__(self, max_size: int = 1000):
-        self.cache: Dict[str, Any] = {}
-        self.access_count: Dict[str, int] = {}
+        # Insertion order doubles as recency: oldest first, most recently used last
+        self.cache: OrderedDict[str, Any] = OrderedDict()
         self.max_size = max_size
         self._lock = threading.Lock()
     
@@ -137,27 +153,24 @@ class CacheManager:
         """Get item from cache"""
         with self._lock:
             if key in self.cache:
-                self.access_count[key] = self.access_count.get(key, 0) + 1
+                self.cache.move_to_end(key)
                 return self.cache[key]
         return None
     
     def put(self, key: str, value: Any):
         """Put item in cache with LRU eviction"""
         with self._lock:
-            if len(self.cache) >= self.max_size:
-                # Remove least recently used item
-                lru_key = min(self.access_count.keys(), key=lambda k: self.access_count[k])
-                del self.cache[lru_key]
-                del self.access_count[lru_key]
-            
+            if key in self.cache:
+                self.cache.move_to_end(key)
             self.cache[key] = value
-            self.access_count[key] = 1
+            if len(self.cache) > self.max_size:
+                # Remove least recently used item
+                self.cache.popitem(last=False)
     
     def clear(self):
         """Clear cache"""
         with self._lock:
             self.cache.clear()
-            self.access_count.clear()
 
 # Global instances
 performance_monitor = PerformanceMonitor()